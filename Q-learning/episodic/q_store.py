@@ -0,0 +1,324 @@
+import abc
+import numpy as np
+import os
+import sys
+
+
+BACKENDS = ('dict', 'dense', 'memmap')
+
+
+class QStore(abc.ABC):
+    """
+    Interface commune des Q-tables. Chaque état est une ligne de num_actions
+    valeurs Q, et deux accès sont distingués:
+    - store[state]: ligne modifiable de l'état (l'état est ajouté s'il est
+      absent); réservé aux mises à jour
+    - store.get(state): lecture sans effet de bord; retourne la ligne
+      stockée (à ne pas modifier) ou, pour un état absent, une ligne de zéros
+      partagée et non modifiable, sans ajouter l'état
+
+    len(store) est le nombre d'états stockés et store.nbytes la mémoire
+    occupée, en octets.
+    """
+
+    backend = None
+
+    def __init__(self, num_actions=4, dtype=np.float64):
+        self.num_actions = num_actions
+        self._set_dtype(dtype)
+
+    def _set_dtype(self, dtype):
+        self.dtype = np.dtype(dtype)
+        self.default = np.zeros(self.num_actions, dtype=self.dtype)
+        self.default.flags.writeable = False
+
+    @abc.abstractmethod
+    def __getitem__(self, state):
+        """
+        Ligne modifiable de l'état, ajouté s'il est absent.
+        """
+
+    @abc.abstractmethod
+    def get(self, state):
+        """
+        Ligne de l'état, sans l'ajouter (ligne de zéros partagée s'il est absent).
+        """
+
+    @abc.abstractmethod
+    def __contains__(self, state):
+        """
+        Indique si l'état est stocké.
+        """
+
+    @abc.abstractmethod
+    def __len__(self):
+        """
+        Nombre d'états stockés.
+        """
+
+    @property
+    @abc.abstractmethod
+    def nbytes(self):
+        """
+        Mémoire occupée, en octets.
+        """
+
+    def get_batch(self, states):
+        """
+        Valeurs Q (N, actions) d'un array (N, 3) d'états, en lecture seule.
+        """
+        states = np.asarray(states).reshape(-1, 3)
+        rows = [self.get(tuple(state)) for state in states.tolist()]
+        return np.array(rows, dtype=self.dtype).reshape(-1, self.num_actions)
+
+    def greedy_actions(self, states):
+        """
+        Meilleure action de chaque état d'un array (N, 3).
+        """
+        return np.argmax(self.get_batch(states), axis=-1)
+
+    def max_values(self, states):
+        """
+        Meilleure valeur Q de chaque état d'un array (N, 3).
+        """
+        return np.max(self.get_batch(states), axis=-1)
+
+
+class DictQStore(QStore):
+    """
+    Q-table par table de hachage: un array de num_actions valeurs par état
+    stocké, indexé par le tuple des features. Ne dépend pas de la taille de
+    la grille, mais chaque état coûte un tuple et un array séparés.
+    """
+
+    backend = 'dict'
+
+    def __init__(self, num_actions=4, dtype=np.float64):
+        super().__init__(num_actions, dtype)
+        self.table = {}
+
+    def __getitem__(self, state):
+        q_values = self.table.get(state)
+        if q_values is None:
+            q_values = self.table[state] = np.zeros(self.num_actions, dtype=self.dtype)
+        return q_values
+
+    def get(self, state):
+        return self.table.get(state, self.default)
+
+    def __contains__(self, state):
+        return state in self.table
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def nbytes(self):
+        """
+        Mémoire du dictionnaire, des tuples clés et des arrays (les entiers
+        des tuples, partagés par Python, ne sont pas comptés).
+        """
+        return (sys.getsizeof(self.table)
+                + sum(sys.getsizeof(state) + sys.getsizeof(q_values)
+                      for state, q_values in self.table.items()))
+
+
+class DenseQStore(QStore):
+    """
+    Q-table dense: un seul ndarray (rows, cols, distances, actions) au lieu
+    d'un dictionnaire de petits arrays.
+
+    Un état (agent_row, agent_col, distance_manhattan_au_goal) est encodé
+    par un entier, index d'une ligne de la vue (num_states, actions): une
+    lecture est une indexation (pas de hachage de tuple), un nouvel état
+    n'alloue rien, et les opérations sur plusieurs états (argmax, max) sont
+    vectorisées. Un état est stocké (marqué comme visité) dès qu'il est
+    accédé par store[state].
+    """
+
+    backend = 'dense'
+
+    def __init__(self, rows, cols, num_actions=4, dtype=np.float64):
+        """
+        Args:
+            rows, cols: Taille de la grille
+            num_actions: Nombre d'actions
+            dtype: Type des valeurs Q
+        """
+        super().__init__(num_actions, dtype)
+        self.rows = rows
+        self.cols = cols
+        # Distance de Manhattan entre deux cases: de 0 à rows + cols - 2
+        self.num_distances = rows + cols - 1
+
+        shape = (rows, cols, self.num_distances, num_actions)
+        self.values, self.visited = self._allocate(shape)
+        self.table = self.values.reshape(-1, num_actions)
+        self._size = int(np.count_nonzero(self.visited))
+
+    def _allocate(self, shape):
+        """
+        Crée le tableau des valeurs et le masque (plat) des états visités.
+        """
+        return (np.zeros(shape, dtype=self.dtype),
+                np.zeros(int(np.prod(shape[:-1])), dtype=bool))
+
+    @property
+    def num_states(self):
+        return len(self.table)
+
+    @property
+    def nbytes(self):
+        """
+        Mémoire occupée par la table (valeurs et marques de visite), en octets.
+        """
+        return self.values.nbytes + self.visited.nbytes
+
+    def encode(self, state):
+        """
+        Index entier de l'état (row, col, distance).
+
+        Raises:
+            ValueError: Si l'état sort de la table (position hors de la
+                        grille ou distance trop grande)
+        """
+        row, col, distance = state
+        if not (0 <= row < self.rows and 0 <= col < self.cols
+                and 0 <= distance < self.num_distances):
+            raise ValueError(f"État {tuple(state)} hors de la Q-table de forme "
+                             f"{self.values.shape} (rows, cols, distances, actions)")
+        return (row * self.cols + col) * self.num_distances + distance
+
+    def encode_batch(self, states):
+        """
+        Index entiers d'un array (..., 3) d'états.
+
+        Raises:
+            ValueError: Si un des états sort de la table
+        """
+        states = np.asarray(states)
+        upper = (self.rows, self.cols, self.num_distances)
+        outside = ((states < 0) | (states >= upper)).any(axis=-1)
+        if outside.any():
+            state = states[outside][0]
+            raise ValueError(f"État {tuple(state.tolist())} hors de la Q-table de forme "
+                             f"{self.values.shape} (rows, cols, distances, actions)")
+        return ((states[..., 0] * self.cols + states[..., 1]) * self.num_distances
+                + states[..., 2])
+
+    def __getitem__(self, state):
+        index = self.encode(state)
+        if not self.visited[index]:
+            self.visited[index] = True
+            self._size += 1
+        return self.table[index]
+
+    def get(self, state):
+        index = self.encode(state)
+        return self.table[index] if self.visited[index] else self.default
+
+    def __contains__(self, state):
+        return bool(self.visited[self.encode(state)])
+
+    def __len__(self):
+        return self._size
+
+    def get_batch(self, states):
+        # Les lignes jamais accédées sont nulles: une seule indexation suffit
+        return self.table[self.encode_batch(states)]
+
+    def snapshot(self):
+        """
+        Vue en lecture seule de toute la table (rows, cols, distances, actions),
+        sans copie. Elle suit les mises à jour suivantes: np.copy() la fige en
+        une seule copie contiguë.
+        """
+        snapshot = self.values.view()
+        snapshot.flags.writeable = False
+        return snapshot
+
+
+class MemmapQStore(DenseQStore):
+    """
+    Q-table dense stockée dans des fichiers .npy projetés en mémoire: seules
+    les pages utilisées sont chargées, et la table persiste d'une exécution
+    à l'autre. Le masque des états visités est rangé à côté des valeurs
+    (<nom>_visited.npy).
+    """
+
+    backend = 'memmap'
+
+    def __init__(self, path, rows, cols, num_actions=4, dtype=np.float64, mode='w+'):
+        """
+        Args:
+            path: Fichier .npy des valeurs Q
+            rows, cols: Taille de la grille
+            num_actions: Nombre d'actions
+            dtype: Type des valeurs Q (celui du fichier si la table est rouverte)
+            mode: 'w+' crée (ou écrase) la table, 'r+' la rouvre en écriture,
+                  'r' en lecture seule
+        """
+        self.path = path
+        self.visited_path = os.path.splitext(path)[0] + '_visited.npy'
+        self.mode = mode
+        super().__init__(rows, cols, num_actions, dtype)
+
+    def _allocate(self, shape):
+        if self.mode == 'w+':
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            values = np.lib.format.open_memmap(self.path, mode='w+', dtype=self.dtype,
+                                               shape=shape)
+            visited = np.lib.format.open_memmap(self.visited_path, mode='w+', dtype=bool,
+                                                shape=(int(np.prod(shape[:-1])),))
+            return values, visited
+
+        values = np.lib.format.open_memmap(self.path, mode=self.mode)
+        if values.shape != shape:
+            raise ValueError(f"Table {self.path} de forme {values.shape}, attendu {shape}")
+        self._set_dtype(values.dtype)
+        return values, np.lib.format.open_memmap(self.visited_path, mode=self.mode)
+
+    def flush(self):
+        """
+        Écrit les modifications sur le disque.
+        """
+        self.values.flush()
+        self.visited.flush()
+
+
+def make_q_store(backend=None, num_actions=4, grid_size=None, path=None, dtype=np.float64):
+    """
+    Crée une Q-table.
+
+    Args:
+        backend: 'dict', 'dense', 'memmap', une instance de QStore (retournée
+                 telle quelle) ou None ('dense' si grid_size est donnée,
+                 sinon 'dict')
+        num_actions: Nombre d'actions
+        grid_size: Taille de la grille (int ou (rows, cols)), requise pour
+                   'dense' et 'memmap'
+        path: Fichier .npy des valeurs Q (backend 'memmap')
+        dtype: Type des valeurs Q
+
+    Returns:
+        store: Instance de QStore
+    """
+    if isinstance(backend, QStore):
+        return backend
+    if backend is None:
+        backend = 'dict' if grid_size is None else 'dense'
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend}. Choix possibles: {BACKENDS}")
+    if backend == 'dict':
+        return DictQStore(num_actions, dtype)
+
+    if grid_size is None:
+        raise ValueError(f"Le backend '{backend}' nécessite grid_size")
+    rows, cols = (grid_size, grid_size) if isinstance(grid_size, int) else grid_size
+    if backend == 'dense':
+        return DenseQStore(rows, cols, num_actions, dtype)
+    if path is None:
+        raise ValueError("Le backend 'memmap' nécessite path")
+    return MemmapQStore(path, rows, cols, num_actions, dtype)
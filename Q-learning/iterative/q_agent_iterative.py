@@ -1,5 +1,5 @@
 import numpy as np
-from collections import defaultdict
+from q_store import make_q_store
 
 
 class QLearningAgentIterative:
@@ -9,7 +9,8 @@ class QLearningAgentIterative:
     """
     
     def __init__(self, num_actions=4, learning_rate=0.1, gamma=0.99, 
-                 epsilon=1.0, epsilon_decay=0.995, epsilon_min=0.01):
+                 epsilon=1.0, epsilon_decay=0.995, epsilon_min=0.01, seed=None,
+                 grid_size=None, q_store=None):
         """
         Initialise l'agent Q-Learning itératif.
         
@@ -20,6 +21,13 @@ class QLearningAgentIterative:
             epsilon: Probabilité d'exploration initiale
             epsilon_decay: Facteur de décroissance d'epsilon
             epsilon_min: Valeur minimale d'epsilon
+            seed: Graine du générateur de l'exploration (int,
+                  np.random.SeedSequence ou None)
+            grid_size: Taille de la grille (int ou (rows, cols)), requise par
+                       les Q-tables denses
+            q_store: Stockage de la Q-table: 'dict', 'dense', 'memmap' ou une
+                     instance de QStore (par défaut 'dense' si grid_size est
+                     donnée, sinon 'dict'; voir q_store.make_q_store)
         """
         self.num_actions = num_actions
         self.lr = learning_rate
@@ -27,9 +35,11 @@ class QLearningAgentIterative:
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
+        self.rng = np.random.default_rng(seed)
         
-        # Q-table: dictionnaire avec clé = state_features, valeur = array d'actions
-        self.q_table = defaultdict(lambda: np.zeros(num_actions))
+        # Q-table: une ligne de valeurs par state_features. Les lectures passent
+        # par q_table.get() (sans ajout d'état), les mises à jour par q_table[state]
+        self.q_table = make_q_store(q_store, num_actions, grid_size)
         
         # Compteur de mises à jour
         self.update_count = 0
@@ -45,12 +55,12 @@ class QLearningAgentIterative:
         Returns:
             action: Action choisie
         """
-        if training and np.random.random() < self.epsilon:
+        if training and self.rng.random() < self.epsilon:
             # Exploration: action aléatoire
-            return np.random.randint(0, self.num_actions)
+            return self.rng.integers(self.num_actions)
         else:
             # Exploitation: meilleure action selon Q-table
-            q_values = self.q_table[state]
+            q_values = self.q_table.get(state)
             return np.argmax(q_values)
     
     def update(self, state, action, reward, next_state, done):
@@ -73,7 +83,7 @@ class QLearningAgentIterative:
             target = reward
         else:
             # Q-learning: max_a' Q(s', a')
-            max_next_q = np.max(self.q_table[next_state])
+            max_next_q = np.max(self.q_table.get(next_state))
             target = reward + self.gamma * max_next_q
         
         # Mise à jour Q-learning
@@ -89,15 +99,15 @@ class QLearningAgentIterative:
     
     def get_q_values(self, state):
         """
-        Retourne les valeurs Q pour un état donné.
+        Retourne les valeurs Q pour un état donné, sans l'ajouter à la Q-table.
         
         Args:
             state: État (features)
             
         Returns:
-            q_values: Array des valeurs Q pour chaque action
+            q_values: Array des valeurs Q pour chaque action (non modifiable)
         """
-        return self.q_table[state]
+        return self.q_table.get(state)
     
     def get_stats(self):
         """
@@ -109,6 +119,8 @@ class QLearningAgentIterative:
         return {
             'epsilon': self.epsilon,
             'q_table_size': len(self.q_table),
+            'q_table_bytes': self.q_table.nbytes,
+            'q_store': self.q_table.backend,
             'update_count': self.update_count,
             'learning_rate': self.lr,
             'gamma': self.gamma
@@ -16,26 +16,16 @@ def visualize_qtable(agent, env, ax, episode):
     """
     ax.clear()
     
-    # Créer une matrice pour stocker les meilleures valeurs Q
-    q_values_grid = np.zeros((env.rows, env.cols))
+    # État de chaque position de la grille, avec la distance au goal actuel
+    rows, cols = np.indices((env.rows, env.cols))
+    distances = np.abs(rows - env.goal_pos[0]) + np.abs(cols - env.goal_pos[1])
+    states = np.stack([rows, cols, distances], axis=-1).reshape(-1, 3)
     
-    # Pour chaque position de la grille
-    for i in range(env.rows):
-        for j in range(env.cols):
-            if (i, j) in env.obstacles:
-                q_values_grid[i, j] = np.nan  # NaN pour les obstacles
-            else:
-                # Calculer la distance moyenne au goal pour cette position
-                # On utilise la position du goal actuel comme référence
-                distance = abs(i - env.goal_pos[0]) + abs(j - env.goal_pos[1])
-                state = (i, j, distance)
-                
-                # Obtenir les valeurs Q pour cet état
-                q_vals = agent.get_q_values(state)
-                if len(q_vals) > 0:
-                    q_values_grid[i, j] = np.max(q_vals)  # Meilleure action
-                else:
-                    q_values_grid[i, j] = 0
+    # Meilleure valeur Q de chaque état, en lecture seule (les états jamais
+    # visités valent 0 et ne sont pas ajoutés à la Q-table)
+    q_values_grid = agent.q_table.max_values(states).reshape(env.rows, env.cols)
+    q_values_grid = q_values_grid.astype(float)
+    q_values_grid[env.grid == env.OBSTACLE] = np.nan  # NaN pour les obstacles
     
     # Créer la heatmap
     im = ax.imshow(q_values_grid, cmap='RdYlGn', aspect='auto')
@@ -114,7 +104,7 @@ def display_info(ax, episode, stats, avg_reward, avg_length,
            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.3))
 
 
-def train_iterative(num_episodes=500, grid_size=5, render_frequency=50):
+def train_iterative(num_episodes=500, grid_size=5, render_frequency=50, seed=None):
     """
     Entraîne un agent Q-Learning de manière itérative.
     Met à jour la Q-table après chaque transition (step).
@@ -123,6 +113,8 @@ def train_iterative(num_episodes=500, grid_size=5, render_frequency=50):
         num_episodes: Nombre d'épisodes d'entraînement
         grid_size: Taille de la grille
         render_frequency: Fréquence d'affichage (tous les N épisodes)
+        seed: Graine des générateurs (int ou None); environnement et agent
+              reçoivent chacun un flux indépendant dérivé d'une SeedSequence
     """
     print("="*60)
     print("Q-LEARNING - MÉTHODE ITÉRATIVE")
@@ -131,13 +123,19 @@ def train_iterative(num_episodes=500, grid_size=5, render_frequency=50):
     print(f"Taille de la grille: {grid_size}x{grid_size}")
     print()
     
+    # Flux aléatoires indépendants dérivés d'une même graine (l'entropie est
+    # sauvegardée dans la config pour pouvoir rejouer l'exécution)
+    seed_sequence = np.random.SeedSequence(seed)
+    env_seed, agent_seed = seed_sequence.spawn(2)
+    
     # Créer l'environnement
     env = DynamicGridWorldEnv(
         grid_size=grid_size,
         obstacles=[(2, 2)],
         step_cost=-0.01,
         goal_reward=10.0,
-        max_steps_per_episode=100
+        max_steps_per_episode=100,
+        seed=env_seed
     )
     
     # Créer l'agent
@@ -147,7 +145,9 @@ def train_iterative(num_episodes=500, grid_size=5, render_frequency=50):
         gamma=0.99,
         epsilon=1.0,
         epsilon_decay=0.995,
-        epsilon_min=0.01
+        epsilon_min=0.01,
+        seed=agent_seed,
+        grid_size=grid_size
     )
     
     # Statistiques d'entraînement
@@ -285,7 +285,8 @@ def train_iterative(num_episodes=500, grid_size=5, render_frequency=50):
             'num_episodes': num_episodes,
             'grid_size': grid_size,
             'learning_rate': agent.lr,
-            'gamma': agent.gamma
+            'gamma': agent.gamma,
+            'seed': seed_sequence.entropy
         }
     }
     
@@ -0,0 +1,240 @@
+import numpy as np
+import os
+import time
+from grid_env_dynamic import DynamicGridWorldEnv, mix_actions
+
+
+class AllGoalsPlanner:
+    """
+    Planificateur qui résout Value Iteration pour toutes les positions
+    possibles du goal en même temps.
+
+    Les tables de valeurs des G goals sont empilées dans un tableau (G, S):
+    chaque sweep met à jour tous les goals d'un lot par une seule opération
+    NumPy. Le résultat est une table de recherche (G, rows, cols) des valeurs
+    et des actions gloutonnes: choisir une action pour un goal donné se
+    réduit à une indexation, sans planification au reset().
+
+    Dans DynamicGridWorldEnv, les obstacles ne sont pas absorbants (l'agent
+    peut s'y trouver): seule la case du goal a une valeur fixée à 0. Avec
+    glissement (slip_prob > 0), les valeurs sont en espérance sur l'action
+    exécutée.
+    """
+
+    def __init__(self, gamma=0.9, theta=1e-6, batch_size=32):
+        """
+        Initialise le planificateur.
+
+        Args:
+            gamma: Facteur d'actualisation
+            theta: Seuil de convergence
+            batch_size: Nombre de goals résolus par lot (None: tous à la fois).
+                        Borne la mémoire à batch_size * S * A valeurs; un lot
+                        itère jusqu'à convergence de son goal le plus lent,
+                        des lots trop grands font donc des sweeps inutiles
+        """
+        self.gamma = gamma
+        self.theta = theta
+        self.batch_size = batch_size
+
+        self.goals = None       # Array (G, 2) des positions de goal
+        self.goal_index = None  # Array (rows, cols): index du goal, -1 si impossible
+        self.values = None      # Array (G, rows, cols)
+        self.policy = None      # Array uint8 (G, rows, cols)
+        self.num_sweeps = 0
+
+    def train(self, env, max_iterations=1000):
+        """
+        Calcule les valeurs optimales pour chaque position libre du goal.
+
+        Args:
+            env: Environnement DynamicGridWorldEnv
+            max_iterations: Nombre maximum de sweeps par lot
+
+        Returns:
+            values: Array (G, rows, cols) des valeurs
+        """
+        rows, cols = env.rows, env.cols
+        num_states = rows * cols
+
+        self.goals = np.argwhere(env.grid != env.OBSTACLE)
+        num_goals = len(self.goals)
+
+        self.goal_index = np.full((rows, cols), -1, dtype=np.int64)
+        self.goal_index[self.goals[:, 0], self.goals[:, 1]] = np.arange(num_goals)
+
+        # Dynamique indépendante du goal: on retire la récompense d'arrivée
+        # au goal du modèle construit pour le premier goal. Les tableaux sont
+        # rangés action par action (A, S) pour que le max sur les actions soit
+        # un simple maximum élément par élément entre A tableaux contigus.
+        mdp = env.to_mdp(goal_pos=tuple(self.goals[0]))
+        next_state = np.ascontiguousarray(mdp.next_state.T)
+        base_reward = np.ascontiguousarray(np.where(mdp.done, env.step_cost, mdp.reward).T)
+        mixing = mdp.action_mixing
+        states = np.arange(num_states)
+        goal_states = self.goals[:, 0] * cols + self.goals[:, 1]
+
+        batch_size = self.batch_size or num_goals
+        self.values = np.empty((num_goals, rows, cols))
+        self.policy = np.empty((num_goals, rows, cols), dtype=np.uint8)
+        self.num_sweeps = 0
+
+        print(f"Planification de {num_goals} goals (lots de {batch_size})...")
+        start_time = time.time()
+
+        for start in range(0, num_goals, batch_size):
+            batch_goals = goal_states[start:start + batch_size]
+            batch = np.arange(len(batch_goals))
+
+            # Pour chaque action, couples (lot, s) dont la transition entre
+            # dans le goal du lot
+            goal_entries = []
+            for action in range(env.num_actions):
+                enters_goal = ((next_state[action][None, :] == batch_goals[:, None]) &
+                               (next_state[action] != states)[None, :])
+                goal_entries.append(np.nonzero(enters_goal))
+
+            V = np.zeros((len(batch_goals), num_states))
+            Q = np.empty((env.num_actions, len(batch_goals), num_states))
+
+            for iteration in range(max_iterations):
+                self._action_values(V, next_state, base_reward, goal_entries,
+                                    env.goal_reward, Q)
+                new_V = np.maximum.reduce(mix_actions(Q, mixing, axis=0))
+                new_V[batch, batch_goals] = 0
+
+                delta = np.max(np.abs(new_V - V))
+                V = new_V
+                self.num_sweeps += 1
+
+                if delta < self.theta:
+                    break
+
+            # Politique gloutonne à partir des valeurs convergées
+            self._action_values(V, next_state, base_reward, goal_entries,
+                                env.goal_reward, Q)
+            stop = start + len(batch_goals)
+            self.values[start:stop] = V.reshape(-1, rows, cols)
+            expected = mix_actions(Q, mixing, axis=0)
+            self.policy[start:stop] = expected.argmax(axis=0).reshape(-1, rows, cols)
+
+        print(f"Planification terminée: {self.num_sweeps} sweeps, "
+              f"{time.time() - start_time:.2f} s")
+        return self.values
+
+    def _action_values(self, V, next_state, base_reward, goal_entries, goal_reward, Q):
+        """
+        Calcule Q[a, b, s] = R(s, a) + gamma * V[b, s'] pour tous les goals
+        du lot; les transitions qui entrent dans le goal valent goal_reward.
+        """
+        for action in range(len(Q)):
+            np.multiply(V[:, next_state[action]], self.gamma, out=Q[action])
+            Q[action] += base_reward[action]
+            Q[action][goal_entries[action]] = goal_reward
+
+    def choose_action(self, state, goal_pos):
+        """
+        Choisit l'action gloutonne pour un goal donné (simple indexation).
+
+        Args:
+            state: Position actuelle (row, col) ou features (row, col, ...)
+            goal_pos: Position du goal (row, col)
+
+        Returns:
+            action: Meilleure action
+        """
+        goal = self.goal_index[goal_pos[0], goal_pos[1]]
+        if goal < 0:
+            raise ValueError(f"Position de goal inconnue: {tuple(goal_pos)}")
+        return int(self.policy[goal, state[0], state[1]])
+
+    def choose_actions(self, states, goal_positions):
+        """
+        Choisit les actions gloutonnes pour un lot d'états et de goals.
+
+        Args:
+            states: Array (N, 2+) des positions (ou features)
+            goal_positions: Array (N, 2) des positions de goal
+
+        Returns:
+            actions: Array uint8 (N,)
+        """
+        states = np.asarray(states)
+        goal_positions = np.asarray(goal_positions)
+        goals = self.goal_index[goal_positions[:, 0], goal_positions[:, 1]]
+        return self.policy[goals, states[:, 0], states[:, 1]]
+
+    def get_value_table(self, goal_pos):
+        """
+        Retourne la table des valeurs pour un goal donné.
+        """
+        return self.values[self.goal_index[goal_pos[0], goal_pos[1]]]
+
+    def save(self, filepath):
+        """
+        Sauvegarde la table de recherche (valeurs, politique, goals) en .npz.
+        """
+        folder = os.path.dirname(filepath)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        np.savez(filepath, values=self.values, policy=self.policy,
+                 goals=self.goals, goal_index=self.goal_index, gamma=self.gamma)
+        print(f"✓ Table de recherche sauvegardée: {filepath}")
+
+    def load(self, filepath):
+        """
+        Charge une table de recherche sauvegardée par save().
+        """
+        data = np.load(filepath)
+        self.values = data['values']
+        self.policy = data['policy']
+        self.goals = data['goals']
+        self.goal_index = data['goal_index']
+        self.gamma = float(data['gamma'])
+
+
+def evaluate(planner, env, num_episodes=500):
+    """
+    Joue des épisodes avec la politique gloutonne du planificateur.
+
+    Returns:
+        dict: Taux de succès, récompense et longueur moyennes
+    """
+    rewards = []
+    lengths = []
+    successes = 0
+
+    for _ in range(num_episodes):
+        state = env.reset()
+        total_reward = 0
+
+        for step in range(env.max_steps_per_episode):
+            action = planner.choose_action(state, env.goal_pos)
+            state, reward, done, _ = env.step(action)
+            total_reward += reward
+            if done:
+                break
+
+        successes += tuple(env.agent_pos) == tuple(env.goal_pos)
+        rewards.append(total_reward)
+        lengths.append(step + 1)
+
+    return {
+        'success_rate': successes / num_episodes,
+        'avg_reward': float(np.mean(rewards)),
+        'avg_length': float(np.mean(lengths))
+    }
+
+
+if __name__ == "__main__":
+    env = DynamicGridWorldEnv(grid_size=5, obstacles=[(2, 2)], step_cost=-0.01,
+                              goal_reward=10.0, max_steps_per_episode=100)
+
+    planner = AllGoalsPlanner(gamma=0.9)
+    planner.train(env)
+    planner.save(os.path.join("results_random", "all_goals_table.npz"))
+
+    stats = evaluate(planner, env)
+    print(f"Taux de succès: {stats['success_rate']:.1%}")
+    print(f"Récompense moyenne: {stats['avg_reward']:.2f}")
+    print(f"Longueur moyenne: {stats['avg_length']:.1f} steps")
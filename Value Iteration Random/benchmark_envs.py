@@ -0,0 +1,75 @@
+import numpy as np
+import time
+from grid_env_dynamic import DynamicGridWorldEnv, VectorDynamicGridWorldEnv
+
+
+def scalar_throughput(grid_size=5, num_steps=200000, obstacles=[(2, 2)], slip_prob=0.0):
+    """
+    Mesure le nombre de pas par seconde de DynamicGridWorldEnv (un agent,
+    reset() à chaque fin d'épisode). Les actions sont tirées à l'avance pour
+    ne mesurer que l'environnement.
+
+    Returns:
+        steps_per_sec: Pas simulés par seconde
+    """
+    env = DynamicGridWorldEnv(grid_size=grid_size, obstacles=obstacles, slip_prob=slip_prob)
+    actions = np.random.randint(0, env.num_actions, size=num_steps).tolist()
+
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    return num_steps / (time.perf_counter() - start)
+
+
+def vector_throughput(num_envs, grid_size=5, num_steps=200000, obstacles=[(2, 2)],
+                      slip_prob=0.0):
+    """
+    Mesure le nombre de pas par seconde (tous environnements confondus) de
+    VectorDynamicGridWorldEnv avec num_envs environnements.
+
+    Returns:
+        steps_per_sec: Pas simulés par seconde
+    """
+    env = VectorDynamicGridWorldEnv(num_envs, grid_size=grid_size, obstacles=obstacles,
+                                    slip_prob=slip_prob)
+    num_batches = max(1, num_steps // num_envs)
+    actions = np.random.randint(0, env.num_actions, size=(num_batches, num_envs))
+
+    env.reset()
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    return num_batches * num_envs / (time.perf_counter() - start)
+
+
+def compare_throughput(grid_size=5, num_steps=200000, num_envs_list=(1, 64, 1024, 16384),
+                       slip_prob=0.0):
+    """
+    Compare le débit (pas par seconde) de l'environnement scalaire et de
+    l'environnement vectorisé pour plusieurs nombres d'environnements.
+
+    Returns:
+        results: Dictionnaire des débits et des accélérations
+    """
+    print("="*60)
+    print(f"DÉBIT DES ENVIRONNEMENTS - grille {grid_size}x{grid_size}, {num_steps} pas")
+    print("="*60)
+
+    scalar = scalar_throughput(grid_size, num_steps, slip_prob=slip_prob)
+    print(f"{'DynamicGridWorldEnv':<30}: {scalar:>14,.0f} pas/s")
+
+    results = {'grid_size': grid_size, 'num_steps': num_steps, 'scalar': scalar, 'vector': {}}
+    for num_envs in num_envs_list:
+        vector = vector_throughput(num_envs, grid_size, num_steps, slip_prob=slip_prob)
+        print(f"{f'Vector (N={num_envs})':<30}: {vector:>14,.0f} pas/s  (x{vector / scalar:.1f})")
+        results['vector'][num_envs] = {'steps_per_sec': vector, 'speedup': vector / scalar}
+
+    return results
+
+
+if __name__ == "__main__":
+    compare_throughput()
+    compare_throughput(slip_prob=0.2)
@@ -0,0 +1,161 @@
+import numpy as np
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from grid_env_dynamic import DynamicGridWorldEnv
+
+
+def exact_random_baseline(env, batch_size=256):
+    """
+    Calcule exactement les statistiques de l'agent aléatoire (politique
+    uniforme) sur DynamicGridWorldEnv, sans échantillonnage.
+
+    L'épisode est une chaîne de Markov absorbante (le goal absorbe) tronquée
+    à max_steps_per_episode pas. Par induction arrière sur l'horizon, pour
+    chaque goal et chaque départ, on calcule la probabilité d'atteindre le
+    goal, la récompense totale attendue et la longueur attendue. Tous les
+    goals d'un lot sont traités ensemble (tableaux (goals, états)), comme
+    dans AllGoalsPlanner. Les statistiques sont ensuite moyennées sur les
+    couples (départ, goal) tirés par reset(): cases libres distinctes,
+    uniformément.
+
+    Args:
+        env: Environnement DynamicGridWorldEnv
+        batch_size: Nombre de goals traités ensemble (borne la mémoire)
+
+    Returns:
+        stats: Dictionnaire avec success_rate (probabilité d'atteindre le
+               goal), avg_reward, avg_length, num_pairs et le détail par
+               goal (success_by_goal, reward_by_goal, length_by_goal)
+    """
+    rows, cols = env.rows, env.cols
+    num_states = rows * cols
+    horizon = env.max_steps_per_episode
+
+    free = env.grid != env.OBSTACLE
+    goals = np.argwhere(free)
+    goal_states = goals[:, 0] * cols + goals[:, 1]
+    num_goals = len(goal_states)
+    if num_goals < 2:
+        raise ValueError("La grille doit contenir au moins deux cases libres")
+
+    # Dynamique indépendante du goal (voir AllGoalsPlanner), rangée action par action
+    mdp = env.to_mdp(goal_pos=tuple(goals[0]))
+    next_state = np.ascontiguousarray(mdp.next_state.T)
+    base_reward = np.ascontiguousarray(np.where(mdp.done, env.step_cost, mdp.reward).T)
+    states = np.arange(num_states)
+
+    # Probabilité de chaque action exécutée: action choisie uniformément,
+    # puis glissement éventuel
+    action_probs = np.full(env.num_actions, 1.0 / env.num_actions)
+    if mdp.action_mixing is not None:
+        action_probs = action_probs @ mdp.action_mixing
+
+    success_by_goal = np.empty(num_goals)
+    reward_by_goal = np.empty(num_goals)
+    length_by_goal = np.empty(num_goals)
+    free_states = free.reshape(-1)
+
+    for start in range(0, num_goals, batch_size):
+        batch_goals = goal_states[start:start + batch_size]
+        batch = np.arange(len(batch_goals))
+
+        enters_goal = [(next_state[action][None, :] == batch_goals[:, None]) &
+                       (next_state[action] != states)[None, :]
+                       for action in range(env.num_actions)]
+
+        # Valeurs avec h pas restants: probabilité de succès, récompense, longueur
+        success = np.zeros((len(batch_goals), num_states))
+        reward = np.zeros((len(batch_goals), num_states))
+        length = np.zeros((len(batch_goals), num_states))
+
+        for _ in range(horizon):
+            new_success = np.zeros_like(success)
+            new_reward = np.zeros_like(reward)
+            new_length = np.zeros_like(length)
+
+            for action, prob in enumerate(action_probs):
+                if prob == 0:
+                    continue
+                entered = enters_goal[action]
+                nxt = next_state[action]
+                new_success += prob * np.where(entered, 1.0, success[:, nxt])
+                new_reward += prob * np.where(entered, env.goal_reward,
+                                              base_reward[action] + reward[:, nxt])
+                new_length += prob * np.where(entered, 1.0, 1.0 + length[:, nxt])
+
+            success, reward, length = new_success, new_reward, new_length
+
+        # Moyenne sur les départs possibles: cases libres autres que le goal
+        starts = np.broadcast_to(free_states, success.shape).copy()
+        starts[batch, batch_goals] = False
+        num_starts = starts.sum(axis=1)
+        stop = start + len(batch_goals)
+        success_by_goal[start:stop] = (success * starts).sum(axis=1) / num_starts
+        reward_by_goal[start:stop] = (reward * starts).sum(axis=1) / num_starts
+        length_by_goal[start:stop] = (length * starts).sum(axis=1) / num_starts
+
+    # Chaque goal a le même nombre de départs: moyenne simple sur les goals
+    return {
+        'success_rate': float(success_by_goal.mean()),
+        'avg_reward': float(reward_by_goal.mean()),
+        'avg_length': float(length_by_goal.mean()),
+        'num_pairs': int(num_goals * (num_goals - 1)),
+        'goals': goals.tolist(),
+        'success_by_goal': success_by_goal.tolist(),
+        'reward_by_goal': reward_by_goal.tolist(),
+        'length_by_goal': length_by_goal.tolist()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baseline exacte de l'agent aléatoire")
+    parser.add_argument('--grid-size', type=int, default=5, help="Taille de la grille")
+    parser.add_argument('--max-steps', type=int, default=100,
+                        help="Nombre maximum de pas par épisode")
+    parser.add_argument('--slip-prob', type=float, default=0.0, help="Probabilité de glissement")
+    parser.add_argument('--compare', type=int, default=0,
+                        help="Nombre d'épisodes simulés (mode vectorisé) pour comparaison")
+    args = parser.parse_args()
+
+    env = DynamicGridWorldEnv(grid_size=args.grid_size, obstacles=[(2, 2)], step_cost=-0.01,
+                              goal_reward=10.0, max_steps_per_episode=args.max_steps,
+                              slip_prob=args.slip_prob)
+
+    print("="*60)
+    print("AGENT ALÉATOIRE - BASELINE EXACTE (CHAÎNE DE MARKOV ABSORBANTE)")
+    print("="*60)
+    start_time = time.time()
+    stats = exact_random_baseline(env)
+    elapsed = time.time() - start_time
+    print(f"{stats['num_pairs']} couples (départ, goal), horizon {args.max_steps} pas: "
+          f"{elapsed:.3f} s")
+    print(f"  Taux de succès: {stats['success_rate']*100:.2f}%")
+    print(f"  Récompense moyenne: {stats['avg_reward']:.4f}")
+    print(f"  Longueur moyenne: {stats['avg_length']:.2f}")
+
+    if args.compare > 0:
+        from random_agent import RandomAgent
+        from train_random import run_random_batched
+
+        start_time = time.time()
+        rewards, lengths, _ = run_random_batched(env, RandomAgent(num_actions=4), args.compare)
+        rewards = np.array(rewards)
+        elapsed = time.time() - start_time
+        print(f"\nMonte Carlo ({args.compare} épisodes, {elapsed:.2f} s):")
+        print(f"  Récompense moyenne: {rewards.mean():.4f} "
+              f"(± {1.96 * rewards.std() / np.sqrt(len(rewards)):.4f})")
+        print(f"  Longueur moyenne: {np.mean(lengths):.2f}")
+
+    output_folder = "results_random"
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(output_folder, f"exact_random_{timestamp}.json")
+    with open(filepath, 'w') as f:
+        json.dump({**stats, 'config': {'grid_size': args.grid_size,
+                                       'max_steps_per_episode': args.max_steps,
+                                       'slip_prob': args.slip_prob}}, f, indent=2)
+    print(f"\n✓ Statistiques sauvegardées: {filepath}")
@@ -1,8 +1,136 @@
 import numpy as np
+from collections import OrderedDict
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle, Circle
 
 
+def mix_actions(values, mixing, axis=-1):
+    """
+    Espérance sur l'action réellement exécutée (glissement).
+    
+    values[..., b] est la valeur de l'action exécutée b; le résultat pour
+    l'action choisie a vaut sum_b mixing[a, b] * values[..., b]. Seuls les
+    coefficients non nuls sont parcourus: le coût est linéaire en nombre
+    de successeurs.
+    
+    Args:
+        values: Array des valeurs par action exécutée
+        mixing: Matrice (A, A) des probabilités, ou None (déterministe)
+        axis: Axe des actions dans values
+        
+    Returns:
+        mixed: Array de même forme que values
+    """
+    if mixing is None:
+        return values
+    
+    values = np.moveaxis(values, axis, 0)
+    mixed = np.zeros_like(values)
+    for action, executed in zip(*np.nonzero(mixing)):
+        mixed[action] += mixing[action, executed] * values[executed]
+    return np.moveaxis(mixed, 0, axis)
+
+
+class TabularMDP:
+    """
+    Modèle tabulaire d'un GridWorld, précalculé une seule fois.
+    
+    Les transitions sont stockées sous forme S×A (S = rows*cols états,
+    A = nombre d'actions), les états étant indexés par get_state_index().
+    next_state, reward et done décrivent l'action effectivement exécutée;
+    avec glissement, action_mixing[a, b] est la probabilité d'exécuter b
+    quand l'action a est choisie.
+    """
+    
+    def __init__(self, rows, cols, next_state, reward, done, terminal, obstacle,
+                 action_mixing=None, rng=None):
+        """
+        Args:
+            rows, cols: Dimensions de la grille
+            next_state: Array int (S, A) des index d'états suivants
+            reward: Array (S, A) des récompenses
+            done: Array booléen (S, A), True si la transition termine l'épisode
+            terminal: Array booléen (S,), True pour le but
+            obstacle: Array booléen (S,), True pour les obstacles
+            action_mixing: Matrice (A, A) des probabilités d'exécution, ou
+                           None si l'action choisie est toujours exécutée
+            rng: Générateur (ou graine) des tirages de rollout(); to_mdp()
+                 passe celui de l'environnement
+        """
+        self.rows = rows
+        self.cols = cols
+        self.next_state = next_state
+        self.reward = reward
+        self.done = done
+        self.terminal = terminal
+        self.obstacle = obstacle
+        self.action_mixing = action_mixing
+        self.rng = np.random.default_rng(rng)
+    
+    @property
+    def deterministic(self):
+        return self.action_mixing is None
+    
+    @property
+    def num_states(self):
+        return self.next_state.shape[0]
+    
+    @property
+    def num_actions(self):
+        return self.next_state.shape[1]
+    
+    def q_values(self, V, gamma):
+        """
+        Calcule Q(s,a) = R(s,a) + gamma * V(s') pour tous les couples (s, a),
+        en espérance sur l'action exécutée en cas de glissement.
+        
+        Args:
+            V: Table des valeurs (rows, cols) ou vecteur (S,)
+            gamma: Facteur d'actualisation
+            
+        Returns:
+            Q: Array (S, A)
+        """
+        V = np.asarray(V).reshape(-1)
+        Q = np.where(self.done, self.reward,
+                     self.reward + gamma * V[self.next_state])
+        return mix_actions(Q, self.action_mixing)
+    
+    def rollout(self, policy, start_state, max_steps=100, rng=None):
+        """
+        Simule un épisode dans le modèle, sans passer par env.step().
+        
+        Args:
+            policy: Array (S,) d'actions ou fonction index_état -> action
+            start_state: Index de l'état de départ
+            max_steps: Nombre maximum de pas
+            rng: Générateur des glissements (par défaut self.rng)
+            
+        Returns:
+            states: Liste des index d'états visités (départ inclus)
+            total_reward: Somme des récompenses
+            done: True si un état terminal a été atteint
+        """
+        rng = self.rng if rng is None else rng
+        state = start_state
+        states = [state]
+        total_reward = 0.0
+        done = False
+        
+        for _ in range(max_steps):
+            action = policy(state) if callable(policy) else policy[state]
+            if self.action_mixing is not None:
+                action = rng.choice(self.num_actions, p=self.action_mixing[action])
+            total_reward += float(self.reward[state, action])
+            done = bool(self.done[state, action])
+            state = int(self.next_state[state, action])
+            states.append(state)
+            if done:
+                break
+        
+        return states, total_reward, done
+
+
 class DynamicGridWorldEnv:
     """
     Environnement GridWorld avec goal dynamique.
@@ -15,8 +143,21 @@ class DynamicGridWorldEnv:
     LEFT = 2
     RIGHT = 3
     
+    # Actions perpendiculaires (glissement)
+    PERPENDICULAR = {UP: (LEFT, RIGHT), DOWN: (LEFT, RIGHT),
+                     LEFT: (UP, DOWN), RIGHT: (UP, DOWN)}
+    
+    # Types de case de la grille d'occupation
+    FREE = 0
+    OBSTACLE = 1
+    GOAL = 2
+    
+    # Nombre de modèles tabulaires gardés en cache (un par position du goal)
+    MDP_CACHE_SIZE = 8
+    
     def __init__(self, grid_size=5, obstacles=[(2, 2)], step_cost=-0.01, 
-                 goal_reward=10.0, max_steps_per_episode=100):
+                 goal_reward=10.0, max_steps_per_episode=100, slip_prob=0.0,
+                 seed=None):
         """
         Initialise l'environnement GridWorld dynamique.
         """
@@ -24,11 +165,23 @@ class DynamicGridWorldEnv:
             self.rows = self.cols = grid_size
         else:
             self.rows, self.cols = grid_size
+        
+        # Grille d'occupation (FREE, OBSTACLE, GOAL): seule source de vérité
+        # pour les obstacles et le goal, lue par step(), to_mdp() et render()
+        self.grid = np.zeros((self.rows, self.cols), dtype=np.int8)
+        self._goal_pos = None
+        self._obstacles_version = 0  # Incrémenté par le setter de obstacles (cache de to_mdp)
+        self._obstacles = None
+        self._obstacles_key = None  # Version de la grille du tuple en cache
+        
+        # Générateur propre à l'environnement (pas d'état global partagé)
+        self.rng = np.random.default_rng(seed)
             
         self.obstacles = obstacles
         self.step_cost = step_cost
         self.goal_reward = goal_reward
         self.max_steps_per_episode = max_steps_per_episode
+        self.slip_prob = slip_prob
         
         self.agent_pos = None
         self.goal_pos = None
@@ -37,25 +190,111 @@ class DynamicGridWorldEnv:
         
         self.obstacle_reward = -1.0
         
+        # Modèles tabulaires en cache, un par position du goal (voir to_mdp)
+        self._mdp_cache = OrderedDict()
+        self._mdp_key = None
+    
+    @classmethod
+    def from_occupancy(cls, occupancy, **kwargs):
+        """
+        Crée un environnement à partir d'une grille d'occupation.
+        
+        Args:
+            occupancy: Array (rows, cols), non nul pour les obstacles
+                       (peut être un np.memmap: il est lu une seule fois)
+            **kwargs: Autres paramètres du constructeur (step_cost, goal_reward...)
+            
+        Returns:
+            env: Environnement DynamicGridWorldEnv
+        """
+        obstacles = np.asarray(occupancy) != 0
+        return cls(grid_size=obstacles.shape, obstacles=obstacles, **kwargs)
+    
+    @property
+    def obstacles(self):
+        """
+        Positions (row, col) des obstacles, sous forme de tuple (non
+        modifiable: pour changer les obstacles, affecter env.obstacles).
+        Le tuple est construit au premier accès puis gardé tant que la
+        grille ne change pas: le setter reste en O(grille) NumPy.
+        """
+        if self._obstacles_key != self._obstacles_version:
+            self._obstacles = tuple(map(tuple, np.argwhere(self.grid == self.OBSTACLE).tolist()))
+            self._obstacles_key = self._obstacles_version
+        return self._obstacles
+    
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        """
+        Remplace les obstacles (liste de positions ou masque booléen).
+        La case du goal n'est jamais marquée comme obstacle.
+        """
+        self.grid[self.grid == self.OBSTACLE] = self.FREE
+        
+        obstacles = np.asarray(obstacles)
+        if obstacles.dtype == bool and obstacles.shape == self.grid.shape:
+            mask = obstacles
+        else:
+            positions = obstacles.reshape(-1, 2).astype(np.int64)
+            mask = np.zeros(self.grid.shape, dtype=bool)
+            mask[positions[:, 0], positions[:, 1]] = True
+        
+        self.grid[mask & (self.grid != self.GOAL)] = self.OBSTACLE
+        self._obstacles_version += 1
+        
+        # Index des cases libres (goal compris), pour les tirages de reset()
+        self._free_states = np.flatnonzero(self.grid.reshape(-1) != self.OBSTACLE)
+    
+    @property
+    def goal_pos(self):
+        """
+        Position (row, col) du goal (la case GOAL de la grille), None avant reset().
+        """
+        return self._goal_pos
+    
+    @goal_pos.setter
+    def goal_pos(self, goal_pos):
+        """
+        Déplace le goal (None le retire). Le goal et un obstacle ne partagent
+        jamais une case: placer le goal sur un obstacle lève une erreur (et
+        le setter de obstacles ignore la case du goal).
+        
+        Raises:
+            ValueError: Si la case est un obstacle
+        """
+        if goal_pos is not None:
+            goal_pos = (int(goal_pos[0]), int(goal_pos[1]))
+            if self.grid[goal_pos] == self.OBSTACLE:
+                raise ValueError(f"Le goal ne peut pas être placé sur un obstacle: {goal_pos}")
+        if self._goal_pos is not None:
+            self.grid[self._goal_pos] = self.FREE
+        self._goal_pos = goal_pos
+        if goal_pos is not None:
+            self.grid[goal_pos] = self.GOAL
+        
     def _get_random_free_position(self):
         """
-        Génère une position aléatoire qui n'est pas un obstacle.
+        Tire une position aléatoire qui n'est pas un obstacle, directement
+        dans l'index des cases libres.
         """
-        while True:
-            pos = (np.random.randint(0, self.rows), 
-                   np.random.randint(0, self.cols))
-            if pos not in self.obstacles:
-                return pos
+        state = self._free_states[self.rng.integers(len(self._free_states))]
+        return divmod(int(state), self.cols)
     
     def reset(self):
         """
         Remet l'agent et le goal à des positions aléatoires.
         """
-        self.agent_pos = list(self._get_random_free_position())
-        self.goal_pos = self._get_random_free_position()
+        free = self._free_states
+        if len(free) < 2:
+            raise ValueError("La grille doit contenir au moins deux cases libres")
         
-        while tuple(self.agent_pos) == self.goal_pos:
-            self.goal_pos = self._get_random_free_position()
+        # Couple (agent, goal) de cases libres distinctes tiré en O(1), sans
+        # rejet: le goal est choisi parmi les len(free) - 1 autres cases
+        agent = self.rng.integers(len(free))
+        goal = self.rng.integers(len(free) - 1)
+        goal += goal >= agent
+        self.agent_pos = list(divmod(int(free[agent]), self.cols))
+        self.goal_pos = divmod(int(free[goal]), self.cols)
         
         self.current_steps = 0
         return tuple(self.agent_pos)
@@ -66,6 +305,10 @@ class DynamicGridWorldEnv:
         """
         self.current_steps += 1
         
+        # Glissement: direction perpendiculaire avec probabilité slip_prob
+        if self.slip_prob > 0 and self.rng.random() < self.slip_prob:
+            action = self.PERPENDICULAR[action][self.rng.integers(2)]
+        
         new_pos = self.agent_pos.copy()
         
         if action == self.UP:
@@ -82,11 +325,11 @@ class DynamicGridWorldEnv:
             new_pos = self.agent_pos.copy()
             reward = self.step_cost
             done = False
-        elif tuple(new_pos) in self.obstacles:
+        elif self.grid[new_pos[0], new_pos[1]] == self.OBSTACLE:
             reward = self.obstacle_reward
             done = False
             self.agent_pos = new_pos
-        elif tuple(new_pos) == self.goal_pos:
+        elif self.grid[new_pos[0], new_pos[1]] == self.GOAL:
             reward = self.goal_reward
             done = True
             self.agent_pos = new_pos
@@ -137,7 +380,7 @@ class DynamicGridWorldEnv:
                     ax.add_patch(rect)
         
         # Obstacles
-        for obs in self.obstacles:
+        for obs in np.argwhere(self.grid == self.OBSTACLE):
             rect = Rectangle((obs[1], self.rows - 1 - obs[0]), 1, 1, 
                            facecolor='gray', edgecolor='black', linewidth=2)
             ax.add_patch(rect)
@@ -172,3 +415,245 @@ class DynamicGridWorldEnv:
         plt.pause(0.01)
         
         return fig, ax
+    
+    def action_mixing(self):
+        """
+        Matrice (A, A) des probabilités d'exécuter l'action b quand l'action
+        a est choisie, ou None sans glissement.
+        """
+        if self.slip_prob == 0:
+            return None
+        
+        mixing = np.eye(self.num_actions) * (1 - self.slip_prob)
+        for action, perpendicular in self.PERPENDICULAR.items():
+            for executed in perpendicular:
+                mixing[action, executed] += self.slip_prob / 2
+        return mixing
+    
+    def get_state_index(self, state):
+        """
+        Convertit une position (row, col) en index d'état unique.
+        """
+        return state[0] * self.cols + state[1]
+    
+    def get_state_from_index(self, index):
+        """
+        Convertit un index d'état en position (row, col).
+        """
+        row = index // self.cols
+        col = index % self.cols
+        return (row, col)
+    
+    def to_mdp(self, goal_pos=None):
+        """
+        Compile la dynamique de l'environnement en modèle tabulaire S×A
+        pour une position du goal donnée.
+        
+        Les modèles des MDP_CACHE_SIZE dernières positions du goal utilisées
+        sont gardés en cache (le moins récemment utilisé est retiré); le cache
+        est vidé si les obstacles ou les récompenses changent. La limite
+        max_steps_per_episode n'est pas représentée dans le modèle.
+        
+        Args:
+            goal_pos: Position du goal (par défaut le goal actuel)
+            
+        Returns:
+            mdp: TabularMDP de l'environnement pour ce goal
+        """
+        if goal_pos is None:
+            goal_pos = self.goal_pos
+        goal_pos = tuple(goal_pos)
+        
+        key = (self.rows, self.cols, self._obstacles_version,
+               self.step_cost, self.goal_reward, self.obstacle_reward, self.slip_prob)
+        if self._mdp_key != key:
+            self._mdp_cache = OrderedDict()
+            self._mdp_key = key
+        if goal_pos in self._mdp_cache:
+            self._mdp_cache.move_to_end(goal_pos)
+            return self._mdp_cache[goal_pos]
+        
+        num_states = self.rows * self.cols
+        states = np.arange(num_states)
+        rows, cols = self.get_state_from_index(states)
+        
+        obstacle = (self.grid == self.OBSTACLE).reshape(-1)
+        terminal = np.zeros(num_states, dtype=bool)
+        terminal[self.get_state_index(goal_pos)] = True
+        
+        next_state = np.empty((num_states, self.num_actions), dtype=np.int64)
+        moves = {self.UP: (-1, 0), self.DOWN: (1, 0),
+                 self.LEFT: (0, -1), self.RIGHT: (0, 1)}
+        bumped = np.empty((num_states, self.num_actions), dtype=bool)
+        for action, (d_row, d_col) in moves.items():
+            new_rows = rows + d_row
+            new_cols = cols + d_col
+            inside = ((0 <= new_rows) & (new_rows < self.rows) &
+                      (0 <= new_cols) & (new_cols < self.cols))
+            next_state[:, action] = np.where(
+                inside, self.get_state_index((new_rows, new_cols)), states)
+            bumped[:, action] = ~inside
+        
+        # Mêmes règles que step(): mur, puis obstacle, puis goal, puis déplacement
+        next_obstacle = obstacle[next_state] & ~bumped
+        next_goal = terminal[next_state] & ~bumped & ~next_obstacle
+        reward = np.where(next_obstacle, self.obstacle_reward,
+                          np.where(next_goal, self.goal_reward, self.step_cost))
+        done = next_goal
+        
+        mdp = TabularMDP(self.rows, self.cols, next_state, reward,
+                         done, terminal, obstacle, self.action_mixing(), rng=self.rng)
+        self._mdp_cache[goal_pos] = mdp
+        if len(self._mdp_cache) > self.MDP_CACHE_SIZE:
+            self._mdp_cache.popitem(last=False)
+        return mdp
+
+
+class VectorDynamicGridWorldEnv:
+    """
+    N environnements DynamicGridWorldEnv simulés ensemble.
+    
+    Les positions de l'agent et du goal des N environnements sont des
+    tableaux d'index d'états; step() calcule les positions suivantes, les
+    récompenses, les fins d'épisode et les observations par opérations
+    NumPy, sans boucle Python par environnement. Un environnement terminé
+    est remis à zéro automatiquement. La dynamique est celle de
+    DynamicGridWorldEnv.step() (murs, obstacles, goal, glissement, limite
+    max_steps_per_episode).
+    """
+    
+    def __init__(self, num_envs, grid_size=5, obstacles=[(2, 2)], step_cost=-0.01,
+                 goal_reward=10.0, max_steps_per_episode=100, slip_prob=0.0,
+                 seed=None):
+        """
+        Initialise les N environnements (mêmes paramètres que DynamicGridWorldEnv).
+        
+        Args:
+            num_envs: Nombre d'environnements simulés ensemble
+            seed: Graine du générateur aléatoire (int, np.random.SeedSequence
+                  ou None), partagé par les N environnements
+        """
+        # Environnement modèle: grille d'occupation et transitions S×A
+        self.env = DynamicGridWorldEnv(grid_size=grid_size, obstacles=obstacles,
+                                       step_cost=step_cost, goal_reward=goal_reward,
+                                       max_steps_per_episode=max_steps_per_episode,
+                                       slip_prob=slip_prob)
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.rows, self.cols = self.env.rows, self.env.cols
+        self.num_actions = self.env.num_actions
+        self.step_cost = step_cost
+        self.goal_reward = goal_reward
+        self.obstacle_reward = self.env.obstacle_reward
+        self.max_steps_per_episode = max_steps_per_episode
+        self.slip_prob = slip_prob
+        
+        obstacle = (self.env.grid == self.env.OBSTACLE).reshape(-1)
+        self._free_states = np.flatnonzero(~obstacle)
+        if len(self._free_states) < 2:
+            raise ValueError("La grille doit contenir au moins deux cases libres")
+        
+        # Déplacement de chaque action (indépendant du goal); contre un mur
+        # l'état suivant est l'état lui-même
+        states = np.arange(self.rows * self.cols)
+        row_ids, col_ids = np.divmod(states, self.cols)
+        self._next_state = np.empty((len(states), self.num_actions), dtype=np.int64)
+        moves = {self.env.UP: (-1, 0), self.env.DOWN: (1, 0),
+                 self.env.LEFT: (0, -1), self.env.RIGHT: (0, 1)}
+        for action, (d_row, d_col) in moves.items():
+            new_rows = row_ids + d_row
+            new_cols = col_ids + d_col
+            inside = ((0 <= new_rows) & (new_rows < self.rows) &
+                      (0 <= new_cols) & (new_cols < self.cols))
+            self._next_state[:, action] = np.where(inside, new_rows * self.cols + new_cols, states)
+        self._obstacle = obstacle
+        self._perpendicular = np.array([self.env.PERPENDICULAR[action]
+                                        for action in range(self.num_actions)])
+        
+        self.agent_state = np.zeros(num_envs, dtype=np.int64)
+        self.goal_state = np.zeros(num_envs, dtype=np.int64)
+        self.current_steps = np.zeros(num_envs, dtype=np.int64)
+    
+    @property
+    def agent_pos(self):
+        """
+        Positions (N, 2) des agents.
+        """
+        return np.stack(np.divmod(self.agent_state, self.cols), axis=1)
+    
+    @property
+    def goal_pos(self):
+        """
+        Positions (N, 2) des goals.
+        """
+        return np.stack(np.divmod(self.goal_state, self.cols), axis=1)
+    
+    def _reset_envs(self, envs):
+        """
+        Tire de nouvelles positions (agent et goal distincts, hors obstacles)
+        pour les environnements donnés, sans rejet (voir DynamicGridWorldEnv.reset()).
+        """
+        free = self._free_states
+        agent = self.rng.integers(0, len(free), size=len(envs))
+        goal = self.rng.integers(0, len(free) - 1, size=len(envs))
+        goal += goal >= agent
+        self.agent_state[envs] = free[agent]
+        self.goal_state[envs] = free[goal]
+        self.current_steps[envs] = 0
+    
+    def reset(self):
+        """
+        Remet les N environnements à zéro.
+        
+        Returns:
+            observations: Array (N, ...) des états initiaux
+        """
+        self._reset_envs(np.arange(self.num_envs))
+        return self._observations()
+    
+    def step(self, actions):
+        """
+        Effectue une action dans chacun des N environnements.
+        
+        Args:
+            actions: Array (N,) des actions
+            
+        Returns:
+            observations: Array (N, ...) des nouveaux états (état initial de
+                          l'épisode suivant pour les environnements terminés)
+            rewards: Array (N,) des récompenses
+            dones: Array booléen (N,) des fins d'épisode
+            info: Dictionnaire avec 'final_observation' (états atteints avant
+                  remise à zéro) et 'success' (goal atteint)
+        """
+        actions = np.asarray(actions)
+        self.current_steps += 1
+        
+        # Glissement: direction perpendiculaire avec probabilité slip_prob
+        if self.slip_prob > 0:
+            slipped = self.rng.random(self.num_envs) < self.slip_prob
+            side = self.rng.integers(0, 2, size=self.num_envs)
+            actions = np.where(slipped, self._perpendicular[actions, side], actions)
+        
+        next_state = self._next_state[self.agent_state, actions]
+        moved = next_state != self.agent_state
+        success = moved & (next_state == self.goal_state)
+        rewards = np.where(moved & self._obstacle[next_state], self.obstacle_reward,
+                           np.where(success, self.goal_reward, self.step_cost))
+        dones = success | (self.current_steps >= self.max_steps_per_episode)
+        self.agent_state = next_state
+        
+        info = {'final_observation': self._observations(), 'success': success}
+        
+        # Remise à zéro automatique des environnements terminés
+        finished = np.flatnonzero(dones)
+        if len(finished) > 0:
+            self._reset_envs(finished)
+        
+        return self._observations(), rewards, dones, info
+    
+    def _observations(self):
+        """
+        Positions (N, 2) des agents, comme DynamicGridWorldEnv.step().
+        """
+        return self.agent_pos
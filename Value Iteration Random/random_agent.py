@@ -7,14 +7,17 @@ class RandomAgent:
     Ne fait AUCUN apprentissage - utilisé comme baseline de comparaison.
     """
     
-    def __init__(self, num_actions=4):
+    def __init__(self, num_actions=4, seed=None):
         """
         Initialise l'agent aléatoire.
         
         Args:
             num_actions: Nombre d'actions possibles
+            seed: Graine du générateur aléatoire (int, np.random.SeedSequence
+                  ou None)
         """
         self.num_actions = num_actions
+        self.rng = np.random.default_rng(seed)
         self.actions_taken = 0
     
     def get_action(self, state=None):
@@ -28,7 +31,21 @@ class RandomAgent:
             action: Action aléatoire
         """
         self.actions_taken += 1
-        return np.random.randint(0, self.num_actions)
+        return self.rng.integers(self.num_actions)
+    
+    def get_actions(self, size):
+        """
+        Tire un bloc d'actions aléatoires en un seul appel (mode vectorisé).
+        Les actions ne sont pas comptées: l'appelant ajoute à actions_taken
+        celles qui sont réellement jouées.
+        
+        Args:
+            size: Forme du bloc, par exemple (num_steps, num_envs)
+            
+        Returns:
+            actions: Array d'actions aléatoires
+        """
+        return self.rng.integers(self.num_actions, size=size)
     
     def get_stats(self):
         """
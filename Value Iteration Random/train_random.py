@@ -1,8 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
-from grid_env_dynamic import DynamicGridWorldEnv
+from grid_env_dynamic import DynamicGridWorldEnv, VectorDynamicGridWorldEnv
 from random_agent import RandomAgent
+import argparse
 import json
 import os
 from datetime import datetime
@@ -53,54 +54,78 @@ def display_info(ax, episode, stats, avg_reward, avg_length,
            bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.3))
 
 
-def train_random(num_episodes=500, grid_size=5, render_frequency=50):
+def draw_dashboard(env, agent, axes, episode, episode_rewards, episode_lengths):
     """
-    Fait jouer un agent aléatoire (baseline sans apprentissage).
-    
-    Args:
-        num_episodes: Nombre d'épisodes
-        grid_size: Taille de la grille
-        render_frequency: Fréquence d'affichage
+    Dessine l'environnement, la courbe de performance, la distribution des
+    récompenses et les informations textuelles.
     """
-    print("="*60)
-    print("AGENT ALÉATOIRE - BASELINE (PAS D'APPRENTISSAGE)")
-    print("="*60)
-    print(f"Nombre d'épisodes: {num_episodes}")
-    print(f"Taille de la grille: {grid_size}x{grid_size}")
-    print()
-    print("⚠️  Cet agent choisit des actions ALÉATOIRES")
-    print("⚠️  Il ne fait AUCUN apprentissage")
-    print("⚠️  Il sert de BASELINE pour comparer avec les méthodes intelligentes")
-    print()
+    ax_env = axes[0, 0]
+    ax_stats = axes[0, 1]
+    ax_comparison = axes[1, 0]
+    ax_info = axes[1, 1]
     
-    # Créer l'environnement
-    env = DynamicGridWorldEnv(
-        grid_size=grid_size,
-        obstacles=[(2, 2)],
-        step_cost=-0.01,
-        goal_reward=10.0,
-        max_steps_per_episode=100
-    )
+    # Afficher l'environnement
+    env.render(fig=ax_env.figure, ax=ax_env)
     
-    # Créer l'agent aléatoire
-    agent = RandomAgent(num_actions=4)
+    # Afficher les informations
+    stats = agent.get_stats()
+    avg_reward = np.mean(episode_rewards[-10:])
+    avg_length = np.mean(episode_lengths[-10:])
+    display_info(ax_info, episode, stats, avg_reward, avg_length,
+                episode_rewards, episode_lengths)
     
-    # Statistiques
+    # Courbe de performance
+    ax_stats.clear()
+    ax_stats.plot(episode_rewards, alpha=0.3, color='red', label='Récompense')
+    if len(episode_rewards) >= 10:
+        moving_avg = np.convolve(episode_rewards, 
+                                np.ones(10)/10, mode='valid')
+        ax_stats.plot(range(9, len(episode_rewards)), moving_avg, 
+                    color='red', linewidth=2, label='Moyenne mobile (10)')
+    ax_stats.axhline(y=0, color='gray', linestyle='--', alpha=0.5)
+    ax_stats.set_xlabel('Épisode')
+    ax_stats.set_ylabel('Récompense')
+    ax_stats.set_title('Performance de l\'Agent Aléatoire')
+    ax_stats.legend()
+    ax_stats.grid(True, alpha=0.3)
+    
+    # Comparaison avec une baseline théorique
+    ax_comparison.clear()
+    ax_comparison.hist(episode_rewards[-100:] if len(episode_rewards) >= 100 else episode_rewards,
+                     bins=20, alpha=0.7, color='red', edgecolor='black')
+    ax_comparison.axvline(x=0, color='gray', linestyle='--', linewidth=2, label='Seuil neutre')
+    ax_comparison.axvline(x=5, color='green', linestyle='--', linewidth=2, label='Seuil succès')
+    ax_comparison.set_xlabel('Récompense')
+    ax_comparison.set_ylabel('Fréquence')
+    ax_comparison.set_title('Distribution des Récompenses')
+    ax_comparison.legend()
+    ax_comparison.grid(True, alpha=0.3, axis='y')
+    
+    plt.tight_layout()
+
+
+def rolling_success_rate(episode_rewards, window=100):
+    """
+    Taux de succès (récompense > 5) sur les window derniers épisodes, pour
+    chaque épisode à partir du window-ième.
+    """
+    successes = np.concatenate([[0], np.cumsum(np.asarray(episode_rewards) > 5)])
+    return ((successes[window:] - successes[:-window]) / window).tolist()
+
+
+def run_random_episodes(env, agent, num_episodes, axes, render_frequency):
+    """
+    Joue les épisodes un par un avec env.step(), avec affichage périodique.
+    
+    Returns:
+        episode_rewards: Récompense totale de chaque épisode
+        episode_lengths: Longueur de chaque épisode
+        success_rate: Taux de succès glissant (voir rolling_success_rate)
+    """
     episode_rewards = []
     episode_lengths = []
     success_rate = []
     
-    # Configuration de la visualisation
-    plt.ion()
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    ax_env = axes[0, 0]
-    ax_stats = axes[0, 1]
-    ax_comparison = axes[1, 0]
-    ax_info = axes[1, 1]
-    
-    print("Début de l'exécution...")
-    print()
-    
     for episode in range(num_episodes):
         state = env.reset()
         episode_reward = 0
@@ -143,47 +168,136 @@ def train_random(num_episodes=500, grid_size=5, render_frequency=50):
         
         # Visualisation périodique
         if (episode + 1) % render_frequency == 0:
-            # Afficher l'environnement
-            env.render(fig=fig, ax=ax_env)
-            
-            # Afficher les informations
-            stats = agent.get_stats()
-            avg_reward = np.mean(episode_rewards[-10:])
-            avg_length = np.mean(episode_lengths[-10:])
-            display_info(ax_info, episode + 1, stats, avg_reward, avg_length,
-                        episode_rewards, episode_lengths)
-            
-            # Courbe de performance
-            ax_stats.clear()
-            ax_stats.plot(episode_rewards, alpha=0.3, color='red', label='Récompense')
-            if len(episode_rewards) >= 10:
-                moving_avg = np.convolve(episode_rewards, 
-                                        np.ones(10)/10, mode='valid')
-                ax_stats.plot(range(9, len(episode_rewards)), moving_avg, 
-                            color='red', linewidth=2, label='Moyenne mobile (10)')
-            ax_stats.axhline(y=0, color='gray', linestyle='--', alpha=0.5)
-            ax_stats.set_xlabel('Épisode')
-            ax_stats.set_ylabel('Récompense')
-            ax_stats.set_title('Performance de l\'Agent Aléatoire')
-            ax_stats.legend()
-            ax_stats.grid(True, alpha=0.3)
-            
-            # Comparaison avec une baseline théorique
-            ax_comparison.clear()
-            ax_comparison.hist(episode_rewards[-100:] if len(episode_rewards) >= 100 else episode_rewards,
-                             bins=20, alpha=0.7, color='red', edgecolor='black')
-            ax_comparison.axvline(x=0, color='gray', linestyle='--', linewidth=2, label='Seuil neutre')
-            ax_comparison.axvline(x=5, color='green', linestyle='--', linewidth=2, label='Seuil succès')
-            ax_comparison.set_xlabel('Récompense')
-            ax_comparison.set_ylabel('Fréquence')
-            ax_comparison.set_title('Distribution des Récompenses')
-            ax_comparison.legend()
-            ax_comparison.grid(True, alpha=0.3, axis='y')
-            
-            plt.tight_layout()
+            draw_dashboard(env, agent, axes, episode + 1, episode_rewards, episode_lengths)
             plt.pause(0.5)
             time.sleep(0.3)
     
+    return episode_rewards, episode_lengths, success_rate
+
+
+def run_random_batched(env, agent, num_episodes, batch_size=4096):
+    """
+    Joue les épisodes par lots de batch_size, simulés ensemble par
+    VectorDynamicGridWorldEnv. Les actions de tout un lot sont tirées en un
+    seul bloc; un épisode terminé ne compte plus (son environnement continue
+    mais ses pas sont ignorés). Les résultats ont la même forme et la même
+    distribution que run_random_episodes().
+    
+    Args:
+        env: DynamicGridWorldEnv dont on reprend la grille, les paramètres
+             et le générateur aléatoire
+        agent: RandomAgent
+        num_episodes: Nombre d'épisodes
+        batch_size: Nombre d'épisodes simulés ensemble
+        
+    Returns:
+        episode_rewards, episode_lengths, success_rate: Comme run_random_episodes()
+    """
+    batch_size = min(batch_size, num_episodes)
+    envs = VectorDynamicGridWorldEnv(
+        batch_size,
+        grid_size=(env.rows, env.cols),
+        obstacles=env.grid == env.OBSTACLE,
+        step_cost=env.step_cost,
+        goal_reward=env.goal_reward,
+        max_steps_per_episode=env.max_steps_per_episode,
+        slip_prob=env.slip_prob,
+        seed=env.rng
+    )
+    
+    episode_rewards = []
+    episode_lengths = []
+    
+    for start in range(0, num_episodes, batch_size):
+        count = min(batch_size, num_episodes - start)
+        envs.reset()
+        actions = agent.get_actions((env.max_steps_per_episode, batch_size))
+        
+        rewards = np.zeros(batch_size)
+        lengths = np.zeros(batch_size, dtype=np.int64)
+        active = np.ones(batch_size, dtype=bool)
+        
+        for step_actions in actions:
+            _, reward, done, _ = envs.step(step_actions)
+            rewards += np.where(active, reward, 0.0)
+            lengths += active
+            active &= ~done
+            if not active.any():
+                break
+        
+        # Seules les actions réellement jouées sont comptées
+        agent.actions_taken += int(lengths[:count].sum())
+        episode_rewards.extend(rewards[:count].tolist())
+        episode_lengths.extend(lengths[:count].tolist())
+    
+    return episode_rewards, episode_lengths, rolling_success_rate(episode_rewards)
+
+
+def train_random(num_episodes=500, grid_size=5, render_frequency=50,
+                 batched=False, batch_size=4096, seed=None):
+    """
+    Fait jouer un agent aléatoire (baseline sans apprentissage).
+    
+    Args:
+        num_episodes: Nombre d'épisodes
+        grid_size: Taille de la grille
+        render_frequency: Fréquence d'affichage
+        batched: Simule les épisodes par lots avec des opérations sur des
+                 tableaux (sans affichage pendant l'exécution)
+        batch_size: Nombre d'épisodes simulés ensemble (mode batched)
+        seed: Graine des générateurs (int ou None); environnement et agent
+              reçoivent chacun un flux indépendant dérivé d'une SeedSequence
+    """
+    print("="*60)
+    print("AGENT ALÉATOIRE - BASELINE (PAS D'APPRENTISSAGE)")
+    print("="*60)
+    print(f"Nombre d'épisodes: {num_episodes}")
+    print(f"Taille de la grille: {grid_size}x{grid_size}")
+    print()
+    print("⚠️  Cet agent choisit des actions ALÉATOIRES")
+    print("⚠️  Il ne fait AUCUN apprentissage")
+    print("⚠️  Il sert de BASELINE pour comparer avec les méthodes intelligentes")
+    print()
+    
+    # Flux aléatoires indépendants dérivés d'une même graine (l'entropie est
+    # sauvegardée dans la config pour pouvoir rejouer l'exécution)
+    seed_sequence = np.random.SeedSequence(seed)
+    env_seed, agent_seed = seed_sequence.spawn(2)
+    
+    # Créer l'environnement
+    env = DynamicGridWorldEnv(
+        grid_size=grid_size,
+        obstacles=[(2, 2)],
+        step_cost=-0.01,
+        goal_reward=10.0,
+        max_steps_per_episode=100,
+        seed=env_seed
+    )
+    
+    # Créer l'agent aléatoire
+    agent = RandomAgent(num_actions=4, seed=agent_seed)
+    
+    print("Début de l'exécution...")
+    print()
+    
+    if batched:
+        # Simulation vectorisée: pas de visualisation pendant l'exécution
+        start_time = time.time()
+        episode_rewards, episode_lengths, success_rate = run_random_batched(
+            env, agent, num_episodes, batch_size)
+        print(f"{num_episodes} épisodes simulés en {time.time() - start_time:.2f} s")
+        print()
+        
+        env.reset()
+        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+        draw_dashboard(env, agent, axes, num_episodes, episode_rewards, episode_lengths)
+    else:
+        # Configuration de la visualisation
+        plt.ion()
+        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+        episode_rewards, episode_lengths, success_rate = run_random_episodes(
+            env, agent, num_episodes, axes, render_frequency)
+    
     print("="*60)
     print("EXÉCUTION TERMINÉE")
     print("="*60)
@@ -220,7 +334,8 @@ def train_random(num_episodes=500, grid_size=5, render_frequency=50):
         'config': {
             'num_episodes': num_episodes,
             'grid_size': grid_size,
-            'agent_type': 'Random'
+            'agent_type': 'Random',
+            'seed': seed_sequence.entropy
         }
     }
     
@@ -253,4 +368,17 @@ def train_random(num_episodes=500, grid_size=5, render_frequency=50):
 
 
 if __name__ == "__main__":
-    agent, env = train_random(num_episodes=500, grid_size=5, render_frequency=50)
+    parser = argparse.ArgumentParser(description="Baseline de l'agent aléatoire")
+    parser.add_argument('--episodes', type=int, default=500, help="Nombre d'épisodes")
+    parser.add_argument('--grid-size', type=int, default=5, help="Taille de la grille")
+    parser.add_argument('--batched', action='store_true',
+                        help="Simulation vectorisée par lots (sans affichage pendant l'exécution)")
+    parser.add_argument('--batch-size', type=int, default=4096,
+                        help="Nombre d'épisodes simulés ensemble")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Graine aléatoire (exécution reproductible)")
+    args = parser.parse_args()
+    
+    agent, env = train_random(num_episodes=args.episodes, grid_size=args.grid_size,
+                              render_frequency=50, batched=args.batched,
+                              batch_size=args.batch_size, seed=args.seed)
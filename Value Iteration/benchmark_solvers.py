@@ -0,0 +1,409 @@
+import numpy as np
+import contextlib
+import io
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from grid_env import GridWorldEnv
+from agents import (ValueIterationAgent, PolicyIterationAgent, IncrementalPlannerAgent,
+                    ShortestPathAgent)
+
+
+def make_random_env(grid_size, obstacle_density=0.1, seed=0):
+    """
+    Crée un GridWorldEnv carré avec des obstacles aléatoires.
+    Le départ est en (0, 0) et le but dans le coin opposé.
+    """
+    rng = np.random.default_rng(seed)
+    mask = rng.random((grid_size, grid_size)) < obstacle_density
+    mask[0, 0] = False
+    mask[grid_size - 1, grid_size - 1] = False
+    obstacles = [(int(i), int(j)) for i, j in np.argwhere(mask)]
+
+    return GridWorldEnv(grid_size=grid_size, start_pos=(0, 0),
+                        goal_pos=(grid_size - 1, grid_size - 1),
+                        obstacles=obstacles, step_cost=-0.01)
+
+
+def timed_train(agent, env, **kwargs):
+    """
+    Entraîne un agent sans afficher ses messages.
+
+    Returns:
+        V: Table des valeurs
+        elapsed: Temps d'entraînement en secondes
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        V = agent.train(env, **kwargs)
+        elapsed = time.perf_counter() - start
+    return np.array(V), elapsed
+
+
+def compare_value_and_policy_iteration(grid_sizes=(20, 50, 100), gamma=0.99,
+                                       obstacle_density=0.1, eval_sweeps=20):
+    """
+    Compare le temps de calcul de Value Iteration et de Policy Iteration
+    (évaluation exacte et Modified Policy Iteration).
+
+    Returns:
+        results: Liste de dictionnaires, un par taille de grille
+    """
+    print("="*72)
+    print(f"VALUE ITERATION vs POLICY ITERATION (gamma = {gamma})")
+    print("="*72)
+    print(f"{'Grille':>9} | {'VI (s)':>8} {'sweeps':>7} | {'PI (s)':>8} {'amél.':>6} | "
+          f"{'MPI (s)':>8} {'amél.':>6} | {'écart max':>9}")
+    print("-"*72)
+
+    results = []
+    for grid_size in grid_sizes:
+        env = make_random_env(grid_size, obstacle_density)
+
+        vi_agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy')
+        V_vi, vi_time = timed_train(vi_agent, env, max_iterations=100000)
+        mdp = env.to_mdp()
+        vi_sweeps = vi_agent.num_backups // max(1, np.count_nonzero(~(mdp.terminal | mdp.obstacle)))
+
+        pi_agent = PolicyIterationAgent(gamma=gamma)
+        V_pi, pi_time = timed_train(pi_agent, env)
+
+        mpi_agent = PolicyIterationAgent(gamma=gamma, theta=1e-6, eval_sweeps=eval_sweeps)
+        V_mpi, mpi_time = timed_train(mpi_agent, env)
+
+        max_diff = max(np.max(np.abs(V_vi - V_pi)), np.max(np.abs(V_mpi - V_pi)))
+
+        print(f"{grid_size:>4}x{grid_size:<4} | {vi_time:>8.3f} {vi_sweeps:>7} | "
+              f"{pi_time:>8.3f} {pi_agent.num_improvements:>6} | "
+              f"{mpi_time:>8.3f} {mpi_agent.num_improvements:>6} | {max_diff:>9.2e}")
+
+        results.append({
+            'grid_size': grid_size,
+            'value_iteration': {'time': vi_time, 'sweeps': int(vi_sweeps)},
+            'policy_iteration': {'time': pi_time,
+                                 'improvements': pi_agent.num_improvements},
+            'modified_policy_iteration': {'time': mpi_time,
+                                          'improvements': mpi_agent.num_improvements,
+                                          'eval_sweeps': eval_sweeps},
+            'max_value_difference': float(max_diff)
+        })
+
+    return results
+
+
+def compare_multigrid(grid_sizes=(128, 256, 512), gamma=0.99, obstacle_density=0.1):
+    """
+    Compare Value Iteration NumPy et Value Iteration multigrille:
+    sweeps par niveau, nombre total de backups, temps de calcul et écart de
+    chacun à une solution de référence (theta = 1e-12).
+
+    Returns:
+        results: Liste de dictionnaires, un par taille de grille
+    """
+    print("="*72)
+    print(f"VALUE ITERATION NUMPY vs MULTIGRILLE (gamma = {gamma})")
+    print("="*72)
+
+    results = []
+    for grid_size in grid_sizes:
+        env = make_random_env(grid_size, obstacle_density)
+        V_exact, _ = timed_train(ValueIterationAgent(gamma=gamma, theta=1e-12, backend='numpy'),
+                                 env, max_iterations=100000)
+
+        numpy_agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy')
+        V_numpy, numpy_time = timed_train(numpy_agent, env, max_iterations=100000)
+
+        multigrid_agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='multigrid')
+        V_multigrid, multigrid_time = timed_train(multigrid_agent, env, max_iterations=100000)
+
+        max_diff = np.max(np.abs(V_numpy - V_multigrid))
+        numpy_error = np.max(np.abs(V_numpy - V_exact))
+        multigrid_error = np.max(np.abs(V_multigrid - V_exact))
+        levels = ", ".join(f"{level['shape'][0]}x{level['shape'][1]}: {level['sweeps']}"
+                           for level in multigrid_agent.level_sweeps)
+
+        print(f"\nGrille {grid_size}x{grid_size}")
+        print(f"  NumPy       : {numpy_agent.num_backups:>12} backups, {numpy_time:.3f} s")
+        print(f"  Multigrille : {multigrid_agent.num_backups:>12} backups, {multigrid_time:.3f} s")
+        print(f"  Sweeps par niveau: {levels}")
+        print(f"  Écart max des valeurs: {max_diff:.2e}")
+        print(f"  Écart max à la référence: NumPy {numpy_error:.2e}, "
+              f"multigrille {multigrid_error:.2e}")
+
+        results.append({
+            'grid_size': grid_size,
+            'numpy': {'time': numpy_time, 'backups': numpy_agent.num_backups,
+                      'max_error': float(numpy_error)},
+            'multigrid': {'time': multigrid_time, 'backups': multigrid_agent.num_backups,
+                          'max_error': float(multigrid_error),
+                          'level_sweeps': [{'shape': list(level['shape']),
+                                            'sweeps': level['sweeps']}
+                                           for level in multigrid_agent.level_sweeps]},
+            'max_value_difference': float(max_diff)
+        })
+
+    return results
+
+
+def compare_parallel(grid_size=1000, worker_counts=(1, 2, 4, 8, 16, 32), gamma=0.9,
+                     obstacle_density=0.1):
+    """
+    Mesure le temps de Value Iteration parallèle selon le nombre de processus
+    et vérifie que les valeurs sont identiques à celles du backend NumPy.
+
+    Returns:
+        results: Liste de dictionnaires, un par nombre de processus
+    """
+    print("="*72)
+    print(f"VALUE ITERATION PARALLÈLE - grille {grid_size}x{grid_size} (gamma = {gamma})")
+    print("="*72)
+
+    env = make_random_env(grid_size, obstacle_density)
+    V_serial, serial_time = timed_train(
+        ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy'), env,
+        max_iterations=100000)
+    print(f"{'série':>10} : {serial_time:.3f} s")
+
+    results = []
+    for num_workers in worker_counts:
+        agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='parallel',
+                                    num_workers=num_workers)
+        V_parallel, parallel_time = timed_train(agent, env, max_iterations=100000)
+        identical = bool(np.array_equal(V_serial, V_parallel))
+
+        print(f"{num_workers:>4} proc. : {parallel_time:.3f} s "
+              f"(accélération x{serial_time / parallel_time:.2f}, "
+              f"valeurs identiques: {'oui' if identical else 'non'})")
+
+        results.append({'num_workers': num_workers, 'time': parallel_time,
+                        'serial_time': serial_time, 'identical_values': identical})
+
+    return results
+
+
+def profile_sweeps(grid_sizes=(64, 128, 256), backends=('numpy', 'prioritized', 'multigrid'),
+                   gamma=0.99, obstacle_density=0.1):
+    """
+    Relève les mesures sweep par sweep (trace de ValueIterationAgent.train)
+    de plusieurs backends, pour suivre les performances selon la taille de
+    la grille.
+
+    Returns:
+        results: Liste de dictionnaires (résumé et trace complète)
+    """
+    print("="*72)
+    print(f"MESURES PAR SWEEP (gamma = {gamma})")
+    print("="*72)
+    print(f"{'Grille':>9} | {'backend':<12} | {'sweeps':>7} | {'backups':>10} | "
+          f"{'temps (s)':>9} | {'backups/s':>10}")
+    print("-"*72)
+
+    results = []
+    for grid_size in grid_sizes:
+        env = make_random_env(grid_size, obstacle_density)
+
+        for backend in backends:
+            agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend=backend)
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, trace = agent.train(env, max_iterations=100000, return_trace=True)
+
+            sweep_time = sum(sweep['sweep_time'] for sweep in trace['sweeps'])
+            rate = trace['total_backups'] / sweep_time if sweep_time > 0 else 0.0
+            print(f"{grid_size:>4}x{grid_size:<4} | {backend:<12} | {len(trace['sweeps']):>7} | "
+                  f"{trace['total_backups']:>10} | {trace['total_time']:>9.3f} | {rate:>10.3g}")
+
+            results.append({'grid_size': grid_size, 'backend': backend,
+                            'backups_per_sec': rate, 'trace': trace})
+
+    return results
+
+
+def compare_dtypes(grid_sizes=(250, 500, 1000), gamma=0.99, obstacle_density=0.1):
+    """
+    Compare les tables de valeurs float64 et float32 (backend NumPy):
+    mémoire maximale allouée pendant l'entraînement, temps, nombre de sweeps
+    et précision (écart des valeurs, actions différentes et perte de la
+    politique float32 évaluée avec les valeurs float64).
+
+    Returns:
+        results: Liste de dictionnaires, un par taille de grille
+    """
+    print("="*72)
+    print(f"FLOAT64 vs FLOAT32 (backend NumPy, gamma = {gamma})")
+    print("="*72)
+
+    results = []
+    for grid_size in grid_sizes:
+        env = make_random_env(grid_size, obstacle_density)
+        mdp = env.to_mdp()  # Modèle partagé, construit hors mesure
+
+        runs = {}
+        for dtype in (np.float64, np.float32):
+            agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy', dtype=dtype)
+            tracemalloc.start()
+            V, elapsed = timed_train(agent, env, max_iterations=100000)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            runs[np.dtype(dtype).name] = {'agent': agent, 'V': V, 'time': elapsed, 'peak': peak}
+
+        V64, V32 = runs['float64']['V'], runs['float32']['V']
+        max_diff = float(np.max(np.abs(V64 - V32.astype(np.float64))))
+        policy32 = runs['float32']['agent'].policy.reshape(-1)
+        Q64 = mdp.q_values(V64, gamma)
+        policy_loss = float(np.max(Q64.max(axis=1) - Q64[np.arange(mdp.num_states), policy32]))
+        changed = int(np.count_nonzero(policy32 != runs['float64']['agent'].policy.reshape(-1)))
+
+        print(f"\nGrille {grid_size}x{grid_size}")
+        result = {'grid_size': grid_size}
+        for name, run in runs.items():
+            sweeps = len(run['agent'].trace['sweeps'])
+            print(f"  {name}: {run['time']:.3f} s, {sweeps} sweeps, "
+                  f"mémoire max {run['peak'] / 1e6:.1f} Mo")
+            result[name] = {'time': run['time'], 'sweeps': sweeps, 'peak_memory': run['peak']}
+        print(f"  Écart max des valeurs: {max_diff:.2e}, actions différentes: {changed}, "
+              f"perte max de la politique float32: {policy_loss:.2e}")
+        result.update({'max_value_difference': max_diff, 'changed_actions': changed,
+                       'policy_loss': policy_loss})
+        results.append(result)
+
+    return results
+
+
+def compare_shortest_path(grid_sizes=(100, 300, 1000), gamma=0.99, obstacle_density=0.1):
+    """
+    Compare Value Iteration NumPy et le calcul des valeurs par plus courts
+    chemins (ShortestPathAgent).
+
+    Returns:
+        results: Liste de dictionnaires, un par taille de grille
+    """
+    print("="*72)
+    print(f"VALUE ITERATION NUMPY vs PLUS COURTS CHEMINS (gamma = {gamma})")
+    print("="*72)
+
+    results = []
+    for grid_size in grid_sizes:
+        env = make_random_env(grid_size, obstacle_density)
+
+        V_numpy, numpy_time = timed_train(
+            ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy'), env,
+            max_iterations=100000)
+        V_shortest, shortest_time = timed_train(ShortestPathAgent(gamma=gamma), env)
+        max_diff = np.max(np.abs(V_numpy - V_shortest))
+
+        print(f"{grid_size:>4}x{grid_size:<4} : NumPy {numpy_time:.3f} s, "
+              f"plus courts chemins {shortest_time:.3f} s "
+              f"(x{numpy_time / shortest_time:.1f}), écart max {max_diff:.2e}")
+
+        results.append({'grid_size': grid_size, 'numpy_time': numpy_time,
+                        'shortest_path_time': shortest_time,
+                        'max_value_difference': float(max_diff)})
+
+    return results
+
+
+def compare_incremental_replanning(grid_size=200, num_changes=50, gamma=0.99,
+                                   obstacle_density=0.1, seed=0):
+    """
+    Compare la replanification incrémentale (D* Lite) à une résolution
+    complète après chaque changement: déplacement du goal, ajout ou retrait
+    d'un obstacle, déplacement de l'agent.
+
+    Returns:
+        results: Dictionnaire des temps moyens et des états développés
+    """
+    print("="*72)
+    print(f"REPLANIFICATION INCRÉMENTALE - grille {grid_size}x{grid_size} ({num_changes} changements)")
+    print("="*72)
+
+    rng = np.random.default_rng(seed)
+    env = make_random_env(grid_size, obstacle_density, seed)
+    num_states = grid_size * grid_size
+
+    planner = IncrementalPlannerAgent(gamma=gamma)
+    _, initial_time = timed_train(planner, env)
+    initial_expansions = planner.last_expansions
+
+    changes = {'goal': [], 'obstacle': [], 'agent': []}
+    full_times = []
+    for _ in range(num_changes):
+        kind = ('goal', 'obstacle', 'agent')[rng.integers(3)]
+        cell = (int(rng.integers(grid_size)), int(rng.integers(grid_size)))
+        if env.grid[cell] == env.OBSTACLE and kind != 'obstacle':
+            continue
+        if kind == 'goal':
+            env.goal_pos = cell
+        elif kind == 'obstacle':
+            if env.grid[cell] == env.GOAL:
+                continue
+            obstacles = env.grid == env.OBSTACLE
+            obstacles[cell] = not obstacles[cell]
+            env.obstacles = obstacles
+        else:
+            env.agent_pos = cell
+
+        start = time.perf_counter()
+        expansions = planner.plan(env)
+        changes[kind].append((time.perf_counter() - start, expansions))
+
+        full_agent = ValueIterationAgent(gamma=gamma, theta=1e-6, backend='numpy')
+        full_times.append(timed_train(full_agent, env, max_iterations=100000)[1])
+
+    full_time = float(np.mean(full_times))
+    print(f"Planification initiale : {initial_time:.4f} s, {initial_expansions} états développés")
+    print(f"Résolution complète (VI NumPy): {full_time:.4f} s, {num_states} états par sweep")
+
+    results = {'grid_size': grid_size, 'num_states': num_states,
+               'initial': {'time': initial_time, 'expansions': initial_expansions},
+               'full_solve_time': full_time, 'changes': {}}
+    for kind, measures in changes.items():
+        if not measures:
+            continue
+        times, expansions = np.array(measures).T
+        print(f"  {kind:<9}: {times.mean():.5f} s en moyenne "
+              f"({times.mean() / full_time:.1%} d'une résolution complète), "
+              f"{expansions.mean():.0f} états développés")
+        results['changes'][kind] = {'count': len(measures), 'mean_time': float(times.mean()),
+                                    'mean_expansions': float(expansions.mean())}
+
+    return results
+
+
+def save_results(results, name, output_folder='results'):
+    """
+    Sauvegarde les résultats d'un benchmark en JSON.
+    """
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(output_folder, f"benchmark_{name}_{timestamp}.json")
+    with open(filepath, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n✓ Résultats sauvegardés: {filepath}")
+
+
+if __name__ == "__main__":
+    results = profile_sweeps()
+    save_results(results, 'sweeps')
+
+    results = compare_dtypes()
+    save_results(results, 'dtypes')
+
+    results = compare_value_and_policy_iteration()
+    save_results(results, 'vi_vs_pi')
+
+    results = compare_multigrid()
+    save_results(results, 'multigrid')
+
+    results = compare_parallel()
+    save_results(results, 'parallel')
+
+    results = compare_shortest_path()
+    save_results(results, 'shortest_path')
+
+    results = compare_incremental_replanning()
+    save_results(results, 'incremental')
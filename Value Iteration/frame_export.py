@@ -0,0 +1,256 @@
+import numpy as np
+import matplotlib
+import matplotlib.image as mpimg
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+from grid_env import GridWorldEnv
+from grid_renderer import GridRenderer
+
+
+class FrameRecorder:
+    """
+    Enregistre l'état compact de chaque frame d'un épisode: position de
+    l'agent, position du but, grille d'occupation et table des valeurs
+    (optionnelle).
+
+    Une frame ne coûte que quelques entiers: la grille n'est copiée que si
+    elle a changé (env.grid_version), et une table des valeurs n'est copiée
+    (en float32) qu'une fois par objet distinct. Une table modifiée sur place
+    après avoir été enregistrée doit donc être passée sous forme de copie.
+    Le rendu est fait ensuite, hors du processus d'entraînement (voir
+    render_frames() et export()).
+    """
+
+    def __init__(self):
+        self.agent = []        # (row, col) de l'agent par frame
+        self.goal = []         # (row, col) du but par frame
+        self.layout = []       # Index de la grille par frame
+        self.value_index = []  # Index de la table des valeurs par frame (-1: aucune)
+        self.grids = []
+        self.value_tables = []
+
+        self._grid_version = None
+        self._last_values = None
+
+    def __len__(self):
+        return len(self.agent)
+
+    def record(self, env, value_table=None):
+        """
+        Enregistre la frame correspondant à l'état actuel de l'environnement.
+
+        Args:
+            env: Environnement GridWorldEnv
+            value_table: Table des valeurs à afficher en heatmap (optionnel)
+        """
+        if env.grid_version != self._grid_version:
+            self.grids.append(env.grid.copy())
+            self._grid_version = env.grid_version
+
+        if value_table is None:
+            values = -1
+        else:
+            if value_table is not self._last_values:
+                self.value_tables.append(np.asarray(value_table, dtype=np.float32).copy())
+                self._last_values = value_table
+            values = len(self.value_tables) - 1
+
+        self.agent.append(tuple(env.agent_pos))
+        self.goal.append(tuple(env.goal_pos))
+        self.layout.append(len(self.grids) - 1)
+        self.value_index.append(values)
+
+    def to_arrays(self):
+        """
+        Retourne l'enregistrement sous forme de tableaux NumPy (voir save()).
+        """
+        rows, cols = self.grids[0].shape if self.grids else (0, 0)
+        return {
+            'agent': np.array(self.agent, dtype=np.int32).reshape(-1, 2),
+            'goal': np.array(self.goal, dtype=np.int32).reshape(-1, 2),
+            'layout': np.array(self.layout, dtype=np.int32),
+            'value_index': np.array(self.value_index, dtype=np.int32),
+            'grids': np.array(self.grids, dtype=np.int8).reshape(-1, rows, cols),
+            'value_tables': np.array(self.value_tables, dtype=np.float32).reshape(-1, rows, cols)
+        }
+
+    def save(self, filepath):
+        """
+        Sauvegarde l'enregistrement dans un fichier .npz.
+        """
+        folder = os.path.dirname(filepath)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        np.savez_compressed(filepath, **self.to_arrays())
+
+
+def load_recording(filepath):
+    """
+    Charge un enregistrement sauvegardé par FrameRecorder.save().
+
+    Returns:
+        recording: Dictionnaire de tableaux (voir FrameRecorder.to_arrays())
+    """
+    with np.load(filepath) as data:
+        return {key: data[key] for key in data.files}
+
+
+class _FrameState:
+    """
+    État d'une frame enregistrée, avec les attributs lus par GridRenderer.
+    """
+
+    FREE = GridWorldEnv.FREE
+    OBSTACLE = GridWorldEnv.OBSTACLE
+    GOAL = GridWorldEnv.GOAL
+
+    def __init__(self, recording):
+        self.recording = recording
+        _, self.rows, self.cols = recording['grids'].shape
+        # Vues fixes: GridRenderer ne recalcule les couleurs que si l'objet change
+        self._value_tables = list(recording['value_tables'])
+
+    def load(self, frame):
+        """
+        Place l'état sur la frame donnée.
+
+        Returns:
+            value_table: Table des valeurs de la frame (ou None)
+        """
+        recording = self.recording
+        self.agent_pos = tuple(recording['agent'][frame])
+        self.goal_pos = tuple(recording['goal'][frame])
+        self.grid_version = int(recording['layout'][frame])
+        self.grid = recording['grids'][self.grid_version]
+        values = recording['value_index'][frame]
+        return None if values < 0 else self._value_tables[values]
+
+
+def _render_chunk(recording, frames, paths, figsize, dpi):
+    """
+    Processus de rendu: dessine les frames données dans des fichiers PNG.
+
+    La figure est construite une seule fois avec le backend Agg (sans
+    fenêtre); chaque frame ne redessine que l'agent (et la heatmap si elle
+    change), puis le tampon RGBA est écrit directement en PNG.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    state = _FrameState(recording)
+
+    state.load(frames[0])
+    renderer = GridRenderer(state, fig=fig, ax=fig.add_subplot())
+    for frame, path in zip(frames, paths):
+        value_table = state.load(frame)
+        renderer.update(value_table)
+        mpimg.imsave(path, np.asarray(fig.canvas.buffer_rgba()))
+
+
+def render_frames(recording, output_dir, num_workers=None, figsize=(8, 8), dpi=100):
+    """
+    Rend toutes les frames d'un enregistrement en PNG, en parallèle.
+
+    Les frames sont réparties en blocs contigus, un par processus, pour que
+    chaque processus ne reconstruise sa figure qu'au changement de grille.
+
+    Args:
+        recording: FrameRecorder ou dictionnaire de load_recording()
+        output_dir: Dossier des images (frame_000000.png, ...)
+        num_workers: Nombre de processus (par défaut le nombre de cœurs)
+        figsize: Taille de la figure en pouces
+        dpi: Résolution
+
+    Returns:
+        paths: Liste des fichiers PNG, dans l'ordre des frames
+    """
+    if isinstance(recording, FrameRecorder):
+        recording = recording.to_arrays()
+    num_frames = len(recording['agent'])
+    if num_frames == 0:
+        raise ValueError("Enregistrement vide: aucune frame à rendre")
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f"frame_{frame:06d}.png") for frame in range(num_frames)]
+
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_frames))
+    chunks = np.array_split(np.arange(num_frames), num_workers)
+    tasks = [(recording, chunk.tolist(), [paths[frame] for frame in chunk], figsize, dpi)
+             for chunk in chunks]
+
+    if num_workers == 1:
+        _render_chunk(*tasks[0])
+    else:
+        with mp.get_context().Pool(num_workers) as pool:
+            pool.starmap(_render_chunk, tasks)
+
+    return paths
+
+
+def export(recording, path, fps=10, num_workers=None, figsize=(8, 8), dpi=100):
+    """
+    Exporte un enregistrement en images PNG, en GIF ou en MP4.
+
+    Args:
+        recording: FrameRecorder ou dictionnaire de load_recording()
+        path: Dossier (frames PNG), fichier .gif ou fichier .mp4 (nécessite ffmpeg)
+        fps: Images par seconde (GIF et MP4)
+        num_workers: Nombre de processus de rendu
+
+    Returns:
+        path: Chemin du résultat
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('', '.gif', '.mp4'):
+        raise ValueError(f"Format non supporté: {extension}. Choix possibles: dossier, .gif, .mp4")
+    if extension == '':
+        render_frames(recording, path, num_workers, figsize, dpi)
+        return path
+
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if extension == '.mp4' and ffmpeg is None:
+        raise RuntimeError("ffmpeg est nécessaire pour l'export MP4")
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    frames_dir = path + '_frames'
+    paths = render_frames(recording, frames_dir, num_workers, figsize, dpi)
+    try:
+        if extension == '.gif':
+            images = [Image.open(frame_path).convert('RGB') for frame_path in paths]
+            images[0].save(path, save_all=True, append_images=images[1:],
+                           duration=int(1000 / fps), loop=0)
+        else:
+            subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps),
+                            '-i', os.path.join(frames_dir, 'frame_%06d.png'),
+                            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+                            path], check=True)
+    finally:
+        shutil.rmtree(frames_dir)
+
+    return path
+
+
+def export_in_background(recording, path, **kwargs):
+    """
+    Lance export() dans un processus séparé et rend la main immédiatement.
+
+    Args:
+        recording: FrameRecorder ou dictionnaire de load_recording()
+        path: Destination (voir export())
+        **kwargs: Paramètres de export() (fps, num_workers, figsize, dpi)
+
+    Returns:
+        process: Processus d'export (à attendre avec process.join())
+    """
+    if isinstance(recording, FrameRecorder):
+        recording = recording.to_arrays()
+    process = mp.get_context().Process(target=export, args=(recording, path), kwargs=kwargs)
+    process.start()
+    return process
@@ -1,6 +1,132 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+from grid_renderer import GridRenderer
+
+
+def mix_actions(values, mixing, axis=-1):
+    """
+    Espérance sur l'action réellement exécutée (glissement).
+    
+    values[..., b] est la valeur de l'action exécutée b; le résultat pour
+    l'action choisie a vaut sum_b mixing[a, b] * values[..., b]. Seuls les
+    coefficients non nuls sont parcourus: le coût est linéaire en nombre
+    de successeurs.
+    
+    Args:
+        values: Array des valeurs par action exécutée
+        mixing: Matrice (A, A) des probabilités, ou None (déterministe)
+        axis: Axe des actions dans values
+        
+    Returns:
+        mixed: Array de même forme que values
+    """
+    if mixing is None:
+        return values
+    
+    values = np.moveaxis(values, axis, 0)
+    mixed = np.zeros_like(values)
+    for action, executed in zip(*np.nonzero(mixing)):
+        mixed[action] += mixing[action, executed] * values[executed]
+    return np.moveaxis(mixed, 0, axis)
+
+
+class TabularMDP:
+    """
+    Modèle tabulaire d'un GridWorld, précalculé une seule fois.
+    
+    Les transitions sont stockées sous forme S×A (S = rows*cols états,
+    A = nombre d'actions), les états étant indexés par get_state_index().
+    next_state, reward et done décrivent l'action effectivement exécutée;
+    avec glissement, action_mixing[a, b] est la probabilité d'exécuter b
+    quand l'action a est choisie.
+    """
+    
+    def __init__(self, rows, cols, next_state, reward, done, terminal, obstacle,
+                 action_mixing=None, rng=None):
+        """
+        Args:
+            rows, cols: Dimensions de la grille
+            next_state: Array int (S, A) des index d'états suivants
+            reward: Array (S, A) des récompenses
+            done: Array booléen (S, A), True si la transition termine l'épisode
+            terminal: Array booléen (S,), True pour le but
+            obstacle: Array booléen (S,), True pour les obstacles
+            action_mixing: Matrice (A, A) des probabilités d'exécution, ou
+                           None si l'action choisie est toujours exécutée
+            rng: Générateur (ou graine) des tirages de rollout(); to_mdp()
+                 passe celui de l'environnement
+        """
+        self.rows = rows
+        self.cols = cols
+        self.next_state = next_state
+        self.reward = reward
+        self.done = done
+        self.terminal = terminal
+        self.obstacle = obstacle
+        self.action_mixing = action_mixing
+        self.rng = np.random.default_rng(rng)
+    
+    @property
+    def deterministic(self):
+        return self.action_mixing is None
+    
+    @property
+    def num_states(self):
+        return self.next_state.shape[0]
+    
+    @property
+    def num_actions(self):
+        return self.next_state.shape[1]
+    
+    def q_values(self, V, gamma):
+        """
+        Calcule Q(s,a) = R(s,a) + gamma * V(s') pour tous les couples (s, a),
+        en espérance sur l'action exécutée en cas de glissement.
+        
+        Args:
+            V: Table des valeurs (rows, cols) ou vecteur (S,)
+            gamma: Facteur d'actualisation
+            
+        Returns:
+            Q: Array (S, A)
+        """
+        V = np.asarray(V).reshape(-1)
+        Q = np.where(self.done, self.reward,
+                     self.reward + gamma * V[self.next_state])
+        return mix_actions(Q, self.action_mixing)
+    
+    def rollout(self, policy, start_state, max_steps=100, rng=None):
+        """
+        Simule un épisode dans le modèle, sans passer par env.step().
+        
+        Args:
+            policy: Array (S,) d'actions ou fonction index_état -> action
+            start_state: Index de l'état de départ
+            max_steps: Nombre maximum de pas
+            rng: Générateur des glissements (par défaut self.rng)
+            
+        Returns:
+            states: Liste des index d'états visités (départ inclus)
+            total_reward: Somme des récompenses
+            done: True si un état terminal a été atteint
+        """
+        rng = self.rng if rng is None else rng
+        state = start_state
+        states = [state]
+        total_reward = 0.0
+        done = False
+        
+        for _ in range(max_steps):
+            action = policy(state) if callable(policy) else policy[state]
+            if self.action_mixing is not None:
+                action = rng.choice(self.num_actions, p=self.action_mixing[action])
+            total_reward += float(self.reward[state, action])
+            done = bool(self.done[state, action])
+            state = int(self.next_state[state, action])
+            states.append(state)
+            if done:
+                break
+        
+        return states, total_reward, done
 
 
 class GridWorldEnv:
@@ -14,8 +140,17 @@ class GridWorldEnv:
     LEFT = 2
     RIGHT = 3
     
+    # Actions perpendiculaires (glissement)
+    PERPENDICULAR = {UP: (LEFT, RIGHT), DOWN: (LEFT, RIGHT),
+                     LEFT: (UP, DOWN), RIGHT: (UP, DOWN)}
+    
+    # Types de case de la grille d'occupation
+    FREE = 0
+    OBSTACLE = 1
+    GOAL = 2
+    
     def __init__(self, grid_size=5, start_pos=(0, 0), goal_pos=(4, 4), 
-                 obstacles=[(2, 2), (3, 2)], step_cost=-0.01):
+                 obstacles=[(2, 2), (3, 2)], step_cost=-0.01, slip_prob=0.0, seed=None):
         """
         Initialise l'environnement GridWorld.
         
@@ -23,18 +158,37 @@ class GridWorldEnv:
             grid_size: Taille de la grille (int pour carré ou tuple pour rectangle)
             start_pos: Position de départ de l'agent (row, col)
             goal_pos: Position du but (row, col)
-            obstacles: Liste des positions des obstacles
+            obstacles: Liste des positions des obstacles, ou masque booléen
+                       (rows, cols)
             step_cost: Coût de chaque déplacement
+            slip_prob: Probabilité de glisser: l'agent part alors dans une
+                       direction perpendiculaire (chacune avec slip_prob / 2)
+            seed: Graine du générateur des glissements (step() et rollouts
+                  du modèle de to_mdp())
         """
         if isinstance(grid_size, int):
             self.rows = self.cols = grid_size
         else:
             self.rows, self.cols = grid_size
             
+        # Grille d'occupation (FREE, OBSTACLE, GOAL): seule source de vérité
+        # pour les obstacles et le but, lue par step(), to_mdp() et render()
+        self.grid = np.zeros((self.rows, self.cols), dtype=np.int8)
+        # Incrémenté par les setters de obstacles et goal_pos (seules écritures de
+        # la grille): clé du cache de to_mdp() et du rendu
+        self.grid_version = 0
+        self._obstacles = None
+        self._obstacles_key = None  # Version de la grille du tuple en cache
+        self._goal_pos = None
+        
         self.start_pos = start_pos
-        self.goal_pos = goal_pos
         self.obstacles = obstacles
+        self.goal_pos = goal_pos
         self.step_cost = step_cost
+        self.slip_prob = slip_prob
+        
+        # Générateur propre à l'environnement (pas d'état global partagé)
+        self.rng = np.random.default_rng(seed)
         
         self.agent_pos = None
         self.num_actions = 4
@@ -43,8 +197,105 @@ class GridWorldEnv:
         self.goal_reward = 1.0
         self.obstacle_reward = -1.0
         
+        # Modèle tabulaire en cache (voir to_mdp)
+        self._mdp = None
+        self._mdp_key = None
+        
+        # Rendu incrémental réutilisé d'un appel de render() à l'autre
+        self._renderer = None
+        
         self.reset()
     
+    @classmethod
+    def from_occupancy(cls, occupancy, start_pos=None, goal_pos=None, **kwargs):
+        """
+        Crée un environnement à partir d'une grille d'occupation.
+        
+        Args:
+            occupancy: Array (rows, cols), non nul pour les obstacles
+                       (peut être un np.memmap: il est lu une seule fois)
+            start_pos: Position de départ (par défaut la première case libre)
+            goal_pos: Position du but (par défaut la dernière case libre)
+            **kwargs: Autres paramètres du constructeur (step_cost, slip_prob, seed)
+        
+        Returns:
+            env: Environnement GridWorldEnv
+        """
+        obstacles = np.asarray(occupancy) != 0
+        if start_pos is None or goal_pos is None:
+            # Première et dernière cases libres, sans index de toutes les cases
+            free = ~obstacles.reshape(-1)
+            first = int(np.argmax(free))
+            last = free.size - 1 - int(np.argmax(free[::-1]))
+            if not free[first] or first == last:
+                raise ValueError("La grille doit contenir au moins deux cases libres")
+            cols = obstacles.shape[1]
+            if start_pos is None:
+                start_pos = divmod(first, cols)
+            if goal_pos is None:
+                goal_pos = divmod(last, cols)
+        
+        return cls(grid_size=obstacles.shape, start_pos=start_pos, goal_pos=goal_pos,
+                   obstacles=obstacles, **kwargs)
+    
+    @property
+    def obstacles(self):
+        """
+        Positions (row, col) des obstacles, sous forme de tuple (non
+        modifiable: pour changer les obstacles, affecter env.obstacles).
+        Le tuple est construit au premier accès puis gardé tant que la
+        grille ne change pas: le setter reste en O(grille) NumPy.
+        """
+        if self._obstacles_key != self.grid_version:
+            self._obstacles = tuple(map(tuple, np.argwhere(self.grid == self.OBSTACLE).tolist()))
+            self._obstacles_key = self.grid_version
+        return self._obstacles
+    
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        """
+        Remplace les obstacles (liste de positions ou masque booléen).
+        La case du but n'est jamais marquée comme obstacle.
+        """
+        self.grid[self.grid == self.OBSTACLE] = self.FREE
+        
+        obstacles = np.asarray(obstacles)
+        if obstacles.dtype == bool and obstacles.shape == self.grid.shape:
+            mask = obstacles
+        else:
+            positions = obstacles.reshape(-1, 2).astype(np.int64)
+            mask = np.zeros(self.grid.shape, dtype=bool)
+            mask[positions[:, 0], positions[:, 1]] = True
+        
+        self.grid[mask & (self.grid != self.GOAL)] = self.OBSTACLE
+        self.grid_version += 1
+    
+    @property
+    def goal_pos(self):
+        """
+        Position (row, col) du but (la case GOAL de la grille).
+        """
+        return self._goal_pos
+    
+    @goal_pos.setter
+    def goal_pos(self, goal_pos):
+        """
+        Déplace le but. Le but et un obstacle ne partagent jamais une case:
+        placer le but sur un obstacle lève une erreur (et le setter de
+        obstacles ignore la case du but).
+        
+        Raises:
+            ValueError: Si la case est un obstacle
+        """
+        goal_pos = (int(goal_pos[0]), int(goal_pos[1]))
+        if self.grid[goal_pos] == self.OBSTACLE:
+            raise ValueError(f"Le but ne peut pas être placé sur un obstacle: {goal_pos}")
+        if self._goal_pos is not None:
+            self.grid[self._goal_pos] = self.FREE
+        self._goal_pos = goal_pos
+        self.grid[self._goal_pos] = self.GOAL
+        self.grid_version += 1
+    
     def reset(self):
         """
         Remet l'agent à sa position de départ.
@@ -68,8 +319,24 @@ class GridWorldEnv:
             done: Episode terminé ou non
             info: Informations supplémentaires
         """
+        # Glissement: direction perpendiculaire avec probabilité slip_prob
+        if self.slip_prob > 0 and self.rng.random() < self.slip_prob:
+            action = self.PERPENDICULAR[action][self.rng.integers(2)]
+        
+        self.agent_pos, reward, done = self._move(self.agent_pos, action)
+        return tuple(self.agent_pos), reward, done, {}
+    
+    def _move(self, agent_pos, action):
+        """
+        Applique une action exécutée depuis une position (sans glissement).
+        
+        Returns:
+            new_pos: Nouvelle position [row, col]
+            reward: Récompense obtenue
+            done: Episode terminé ou non
+        """
         # Calcul de la nouvelle position
-        new_pos = self.agent_pos.copy()
+        new_pos = list(agent_pos)
         
         if action == self.UP:
             new_pos[0] -= 1
@@ -83,104 +350,93 @@ class GridWorldEnv:
         # Vérification des limites de la grille
         if not (0 <= new_pos[0] < self.rows and 0 <= new_pos[1] < self.cols):
             # Collision avec un mur, l'agent reste en place
-            new_pos = self.agent_pos.copy()
+            new_pos = list(agent_pos)
         
-        # Vérification des obstacles
-        if tuple(new_pos) in self.obstacles:
+        # Vérification des obstacles (lecture O(1) dans la grille)
+        cell = self.grid[new_pos[0], new_pos[1]]
+        if cell == self.OBSTACLE:
             # Collision avec un obstacle
+            # (l'agent se déplace quand même sur l'obstacle)
             reward = self.obstacle_reward
             done = False
-            self.agent_pos = new_pos  # L'agent se déplace quand même sur l'obstacle
-        elif tuple(new_pos) == self.goal_pos:
+        elif cell == self.GOAL:
             # Atteint le but
             reward = self.goal_reward
             done = True
-            self.agent_pos = new_pos
         else:
             # Déplacement normal
             reward = self.step_cost
             done = False
-            self.agent_pos = new_pos
         
-        return tuple(self.agent_pos), reward, done, {}
+        return new_pos, reward, done
+    
+    def action_mixing(self):
+        """
+        Matrice (A, A) des probabilités d'exécuter l'action b quand l'action
+        a est choisie, ou None sans glissement.
+        """
+        if self.slip_prob == 0:
+            return None
+        
+        mixing = np.eye(self.num_actions) * (1 - self.slip_prob)
+        for action, perpendicular in self.PERPENDICULAR.items():
+            for executed in perpendicular:
+                mixing[action, executed] += self.slip_prob / 2
+        return mixing
+    
+    def transitions(self, state, action):
+        """
+        Liste des issues possibles d'une action, sans modifier l'environnement.
+        
+        Args:
+            state: Position (row, col)
+            action: Action choisie
+            
+        Returns:
+            transitions: Liste de (probabilité, next_state, reward, done)
+        """
+        mixing = self.action_mixing()
+        if mixing is None:
+            outcomes = [(1.0, action)]
+        else:
+            outcomes = [(mixing[action, executed], executed)
+                        for executed in np.flatnonzero(mixing[action])]
+        
+        transitions = []
+        for prob, executed in outcomes:
+            new_pos, reward, done = self._move(state, executed)
+            transitions.append((prob, tuple(new_pos), reward, done))
+        return transitions
     
-    def render(self, value_table=None, fig=None, ax=None):
+    def render(self, value_table=None, fig=None, ax=None, title=None, max_annotated_cells=None):
         """
         Affiche la grille avec Matplotlib.
         
+        La grille est construite une seule fois (voir GridRenderer); les appels
+        suivants sur la même figure ne redessinent que l'agent, et la heatmap
+        si value_table change.
+        
         Args:
             value_table: Matrice optionnelle des valeurs d'états pour afficher une heatmap
             fig: Figure matplotlib existante (optionnel)
             ax: Axes matplotlib existant (optionnel)
+            title: Titre des axes (optionnel, gardé d'un appel à l'autre)
+            max_annotated_cells: Nombre de cases au-delà duquel les textes par
+                                 case sont omis (par défaut
+                                 GridRenderer.MAX_ANNOTATED_CELLS)
+            
+        Returns:
+            fig, ax: Figure et axes du rendu
         """
-        # Utiliser la figure existante ou en créer une nouvelle
-        if fig is None or ax is None:
-            fig, ax = plt.subplots(figsize=(8, 8))
-        else:
-            ax.clear()
+        renderer = self._renderer
+        if (renderer is None or not renderer.draws_on(fig, ax) or
+                (max_annotated_cells is not None and
+                 max_annotated_cells != renderer.max_annotated_cells)):
+            self._renderer = GridRenderer(self, fig=fig, ax=ax,
+                                          max_annotated_cells=max_annotated_cells)
         
-        # Si value_table est fourni, créer une heatmap
-        if value_table is not None:
-            # Normaliser les valeurs pour la couleur
-            vmin = np.min(value_table)
-            vmax = np.max(value_table)
-            
-            for i in range(self.rows):
-                for j in range(self.cols):
-                    # Couleur basée sur la valeur
-                    if vmax > vmin:
-                        normalized_value = (value_table[i, j] - vmin) / (vmax - vmin)
-                    else:
-                        normalized_value = 0.5
-                    
-                    color = plt.cm.viridis(normalized_value)
-                    rect = Rectangle((j, self.rows - 1 - i), 1, 1, 
-                                    facecolor=color, edgecolor='black', linewidth=2)
-                    ax.add_patch(rect)
-                    
-                    # Afficher la valeur numérique
-                    ax.text(j + 0.5, self.rows - 1 - i + 0.5, 
-                           f'{value_table[i, j]:.2f}',
-                           ha='center', va='center', fontsize=10, fontweight='bold')
-        else:
-            # Grille simple sans valeurs
-            for i in range(self.rows):
-                for j in range(self.cols):
-                    rect = Rectangle((j, self.rows - 1 - i), 1, 1, 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-                    ax.add_patch(rect)
-        
-        # Dessiner les obstacles
-        for obs in self.obstacles:
-            rect = Rectangle((obs[1], self.rows - 1 - obs[0]), 1, 1, 
-                           facecolor='gray', edgecolor='black', linewidth=2)
-            ax.add_patch(rect)
-            ax.text(obs[1] + 0.5, self.rows - 1 - obs[0] + 0.5, 
-                   'X', ha='center', va='center', fontsize=20, color='white', fontweight='bold')
-        
-        # Dessiner le but
-        rect = Rectangle((self.goal_pos[1], self.rows - 1 - self.goal_pos[0]), 1, 1, 
-                       facecolor='gold', edgecolor='black', linewidth=2)
-        ax.add_patch(rect)
-        ax.text(self.goal_pos[1] + 0.5, self.rows - 1 - self.goal_pos[0] + 0.5, 
-               'G', ha='center', va='center', fontsize=20, color='green', fontweight='bold')
-        
-        # Dessiner l'agent
-        ax.plot(self.agent_pos[1] + 0.5, self.rows - 1 - self.agent_pos[0] + 0.5, 
-               'ro', markersize=20, label='Agent')
-        
-        ax.set_xlim(0, self.cols)
-        ax.set_ylim(0, self.rows)
-        ax.set_aspect('equal')
-        ax.set_xticks(range(self.cols + 1))
-        ax.set_yticks(range(self.rows + 1))
-        ax.grid(True)
-        ax.set_title('GridWorld Environment', fontsize=16, fontweight='bold')
-        
-        plt.tight_layout()
-        plt.pause(0.1)  # Pause courte pour animation fluide
-        
-        return fig, ax
+        self._renderer.update(value_table, title)
+        return self._renderer.fig, self._renderer.ax
     
     def get_state_index(self, state):
         """
@@ -195,3 +451,50 @@ class GridWorldEnv:
         row = index // self.cols
         col = index % self.cols
         return (row, col)
+    
+    def to_mdp(self):
+        """
+        Compile la dynamique de l'environnement en modèle tabulaire S×A.
+        
+        Le modèle est construit une seule fois puis mis en cache; il est
+        reconstruit automatiquement si le but, les obstacles ou les
+        récompenses changent.
+        
+        Returns:
+            mdp: TabularMDP de l'environnement
+        """
+        key = (self.rows, self.cols, self.grid_version,
+               self.step_cost, self.goal_reward, self.obstacle_reward, self.slip_prob)
+        if self._mdp is not None and self._mdp_key == key:
+            return self._mdp
+        
+        num_states = self.rows * self.cols
+        states = np.arange(num_states)
+        rows, cols = self.get_state_from_index(states)
+        
+        obstacle = (self.grid == self.OBSTACLE).reshape(-1)
+        terminal = (self.grid == self.GOAL).reshape(-1)
+        
+        next_state = np.empty((num_states, self.num_actions), dtype=np.int64)
+        moves = {self.UP: (-1, 0), self.DOWN: (1, 0),
+                 self.LEFT: (0, -1), self.RIGHT: (0, 1)}
+        for action, (d_row, d_col) in moves.items():
+            new_rows = rows + d_row
+            new_cols = cols + d_col
+            # Collision avec un mur: l'agent reste en place
+            inside = ((0 <= new_rows) & (new_rows < self.rows) &
+                      (0 <= new_cols) & (new_cols < self.cols))
+            next_state[:, action] = np.where(
+                inside, self.get_state_index((new_rows, new_cols)), states)
+        
+        # Mêmes règles que step(): obstacle, puis but, puis déplacement normal
+        next_obstacle = obstacle[next_state]
+        next_goal = terminal[next_state]
+        reward = np.where(next_obstacle, self.obstacle_reward,
+                          np.where(next_goal, self.goal_reward, self.step_cost))
+        done = next_goal & ~next_obstacle
+        
+        self._mdp = TabularMDP(self.rows, self.cols, next_state, reward,
+                               done, terminal, obstacle, self.action_mixing(), rng=self.rng)
+        self._mdp_key = key
+        return self._mdp
@@ -0,0 +1,190 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+
+
+class GridRenderer:
+    """
+    Rendu incrémental d'un GridWorld avec Matplotlib.
+
+    La grille est dessinée une seule fois sous forme d'une image (imshow),
+    une case par pixel. À chaque frame, seul le marqueur de l'agent est
+    redessiné par blitting sur un fond mémorisé: en dehors d'une comparaison
+    vectorisée de la table des valeurs, le coût d'une frame ne dépend pas de
+    la taille de la grille. Les couleurs de l'image ne sont recalculées (et
+    le fond redessiné) que si la table des valeurs, le but ou les obstacles
+    changent.
+    """
+
+    # Au-delà, pas de texte par case (valeurs, 'X', 'G'), par défaut
+    MAX_ANNOTATED_CELLS = 400
+    # Au-delà, pas de graduation ni de lignes de grille
+    MAX_TICKS = 50
+
+    FREE_COLOR = to_rgba('white')
+    OBSTACLE_COLOR = to_rgba('gray')
+    GOAL_COLOR = to_rgba('gold')
+
+    def __init__(self, env, fig=None, ax=None, max_annotated_cells=None):
+        """
+        Construit les artistes de la grille.
+
+        Args:
+            env: Environnement GridWorldEnv
+            fig: Figure matplotlib existante (optionnel)
+            ax: Axes matplotlib existant (optionnel, vidé)
+            max_annotated_cells: Nombre de cases au-delà duquel les textes par
+                                 case ne sont pas affichés (par défaut
+                                 MAX_ANNOTATED_CELLS)
+        """
+        if fig is None or ax is None:
+            fig, ax = plt.subplots(figsize=(8, 8))
+        else:
+            ax.clear()
+
+        self.env = env
+        self.fig = fig
+        self.ax = ax
+        self.max_annotated_cells = (self.MAX_ANNOTATED_CELLS if max_annotated_cells is None
+                                    else max_annotated_cells)
+        self.values = None       # Copie de la table des valeurs du dernier rendu
+        self._layout = None      # (but, version de la grille) du dernier rendu
+        self._background = None  # Fond mémorisé pour le blitting
+        self._texts = []
+
+        rows, cols = env.rows, env.cols
+        self.image = ax.imshow(np.zeros((rows, cols, 4)), extent=(0, cols, 0, rows),
+                               origin='upper', interpolation='nearest')
+
+        markersize = min(20.0, 400.0 / max(rows, cols))
+        self.agent, = ax.plot([], [], 'ro', markersize=markersize, label='Agent')
+
+        ax.set_xlim(0, cols)
+        ax.set_ylim(0, rows)
+        ax.set_aspect('equal')
+        if max(rows, cols) <= self.MAX_TICKS:
+            ax.set_xticks(range(cols + 1))
+            ax.set_yticks(range(rows + 1))
+            ax.grid(True, color='black')
+        else:
+            ax.set_xticks([])
+            ax.set_yticks([])
+        ax.set_title('GridWorld Environment', fontsize=16, fontweight='bold')
+        fig.tight_layout()
+
+        # Le fond mémorisé n'est plus valable après un redimensionnement
+        fig.canvas.mpl_connect('resize_event', self._invalidate)
+
+    def draws_on(self, fig, ax):
+        """
+        Indique si ce rendu peut être réutilisé pour (fig, ax).
+        Sans figure donnée, la figure du rendu est réutilisée tant qu'elle est ouverte.
+        """
+        if fig is None or ax is None:
+            return plt.fignum_exists(self.fig.number)
+        return fig is self.fig and ax is self.ax
+
+    def update(self, value_table=None, title=None):
+        """
+        Met à jour le rendu pour l'état actuel de l'environnement.
+
+        Args:
+            value_table: Matrice optionnelle des valeurs d'états (heatmap). Elle
+                         est comparée à une copie de la précédente: une table
+                         modifiée sur place est bien redessinée
+            title: Nouveau titre des axes (optionnel). Il doit passer par ici,
+                   et non par ax.set_title(), pour faire partie du fond mémorisé
+        """
+        if title is not None and title != self.ax.get_title():
+            self.ax.set_title(title, fontsize=16, fontweight='bold')
+            self._background = None
+
+        env = self.env
+        layout = (tuple(env.goal_pos), env.grid_version)
+
+        if self._values_changed(value_table) or layout != self._layout:
+            self.values = None if value_table is None else np.array(value_table)
+            self._layout = layout
+            self._recolor()
+            self._background = None
+
+        row, col = env.agent_pos
+        self.agent.set_data([col + 0.5], [env.rows - 1 - row + 0.5])
+        self._blit()
+
+    def _values_changed(self, value_table):
+        """
+        Indique si la table des valeurs diffère de celle du dernier rendu.
+        """
+        if value_table is None or self.values is None:
+            return value_table is not None or self.values is not None
+        value_table = np.asarray(value_table)
+        return (value_table.shape != self.values.shape
+                or not np.array_equal(value_table, self.values))
+
+    def _recolor(self):
+        """
+        Recalcule les couleurs des cases (et les textes des petites grilles).
+        """
+        env = self.env
+        values = self.values
+
+        if values is None:
+            colors = np.empty((env.rows, env.cols, 4))
+            colors[:] = self.FREE_COLOR
+        else:
+            # Normaliser les valeurs pour la couleur
+            vmin, vmax = values.min(), values.max()
+            if vmax > vmin:
+                colors = plt.cm.viridis((values - vmin) / (vmax - vmin))
+            else:
+                colors = plt.cm.viridis(np.full(values.shape, 0.5))
+
+        obstacles = env.grid == env.OBSTACLE
+        colors[obstacles] = self.OBSTACLE_COLOR
+        colors[env.grid == env.GOAL] = self.GOAL_COLOR
+        self.image.set_data(colors)
+
+        for text in self._texts:
+            text.remove()
+        self._texts = []
+        if env.rows * env.cols > self.max_annotated_cells:
+            return
+
+        def add_text(row, col, label, **kwargs):
+            self._texts.append(self.ax.text(col + 0.5, env.rows - 1 - row + 0.5, label,
+                                            ha='center', va='center', fontweight='bold',
+                                            **kwargs))
+
+        if values is not None:
+            for i, j in np.argwhere(env.grid == env.FREE):
+                add_text(i, j, f'{values[i, j]:.2f}', fontsize=10)
+        for i, j in np.argwhere(obstacles):
+            add_text(i, j, 'X', fontsize=20, color='white')
+        add_text(env.goal_pos[0], env.goal_pos[1], 'G', fontsize=20, color='green')
+
+    def _invalidate(self, event=None):
+        self._background = None
+
+    def _blit(self):
+        """
+        Affiche la frame: restaure le fond mémorisé puis dessine l'agent.
+        Le fond (sans l'agent) est recapturé par un rendu complet si besoin.
+        """
+        canvas = self.fig.canvas
+        if not canvas.supports_blit:
+            canvas.draw_idle()
+            canvas.flush_events()
+            return
+
+        if self._background is None:
+            self.agent.set_visible(False)
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.ax.bbox)
+            self.agent.set_visible(True)
+        else:
+            canvas.restore_region(self._background)
+
+        self.ax.draw_artist(self.agent)
+        canvas.blit(self.ax.bbox)
+        canvas.flush_events()
@@ -2,9 +2,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from grid_env import GridWorldEnv
 from agents import RandomAgent, ValueIterationAgent
+from map_loader import load_env
+from frame_export import FrameRecorder, export_in_background
+import argparse
 import time
 import json
 import os
+import sys
 from datetime import datetime
 
 
@@ -290,9 +294,8 @@ def main():
     print("\nAffichage de la grille avec les valeurs d'états...")
     print("Les valeurs augmentent en s'approchant du but (case dorée 'G').")
     print("Les cases plus claires ont des valeurs plus élevées.")
-    fig, ax = env.render(value_table=value_table, fig=fig, ax=ax)
-    ax.set_title('GridWorld - State Values après Value Iteration', 
-                fontsize=16, fontweight='bold')
+    fig, ax = env.render(value_table=value_table, fig=fig, ax=ax,
+                         title='GridWorld - State Values après Value Iteration')
     
     # Sauvegarder la figure
     if save_figures:
@@ -357,5 +360,227 @@ def main():
     plt.show()
 
 
+def parse_args(argv=None):
+    """
+    Analyse les arguments du mode batch (sans interaction).
+    
+    Returns:
+        args: Arguments (argparse.Namespace)
+    """
+    parser = argparse.ArgumentParser(
+        description="GridWorld Value Iteration. Sans argument, lance le mode interactif; "
+                    "avec des arguments, s'exécute sans saisie, sans pause ni fenêtre.")
+    parser.add_argument('--config', default='config.json',
+                        help="Fichier de configuration JSON (défaut: config.json)")
+    parser.add_argument('--map', dest='map_file',
+                        help="Carte .npy, .png ou ASCII (remplace grille et obstacles du fichier "
+                             "de configuration)")
+    parser.add_argument('--grid-size', type=int,
+                        help="Taille de la grille: départ en (0, 0), but dans le coin opposé, "
+                             "seuls les obstacles de la configuration contenus dans la grille (hors but) "
+                             "sont gardés")
+    parser.add_argument('--no-render', action='store_true',
+                        help="Aucun travail de figure matplotlib: pas de png par défaut, "
+                             "incompatible avec --format png et --record")
+    parser.add_argument('--format', dest='formats', nargs='+',
+                        choices=('txt', 'npy', 'png', 'json'),
+                        help="Fichiers de sortie: table des valeurs (txt, npy), figure (png), "
+                             "résumé avec les temps de chaque phase (json). Défaut: txt et png "
+                             "(txt seul avec --no-render) si save_figures est vrai")
+    parser.add_argument('--output-folder', help="Dossier des résultats")
+    parser.add_argument('--backend', default='numpy', choices=ValueIterationAgent.BACKENDS,
+                        help="Backend de Value Iteration (défaut: numpy)")
+    parser.add_argument('--gamma', type=float, default=0.9, help="Facteur d'actualisation")
+    parser.add_argument('--max-iterations', type=int, default=1000,
+                        help="Nombre maximum de sweeps")
+    parser.add_argument('--max-steps', type=int,
+                        help="Nombre maximum de pas de l'évaluation (défaut: nombre de cases)")
+    parser.add_argument('--record',
+                        help="Enregistre l'évaluation et l'exporte (dossier de PNG, .gif ou .mp4) "
+                             "dans un processus séparé")
+    parser.add_argument('--fps', type=int, default=10, help="Images par seconde de --record")
+    
+    args = parser.parse_args(argv)
+    if args.no_render and args.formats and 'png' in args.formats:
+        parser.error("--format png est incompatible avec --no-render")
+    if args.no_render and args.record:
+        parser.error("--record est incompatible avec --no-render")
+    return args
+
+
+def build_batch_env(args):
+    """
+    Construit l'environnement du mode batch à partir des arguments.
+    
+    Returns:
+        env: Environnement GridWorldEnv
+        save_figures: Valeur de save_figures dans la configuration
+        output_folder: Dossier des résultats
+    """
+    save_figures, output_folder = True, 'results'
+    config = None
+    if os.path.exists(args.config):
+        config = load_config_from_file(args.config)
+        if config is None:
+            raise SystemExit(f"Configuration invalide: {args.config}")
+        grid_size, start_pos, goal_pos, obstacles, _, save_figures, output_folder = config
+    elif args.config != 'config.json' or (args.map_file is None and args.grid_size is None):
+        raise SystemExit(f"Fichier de configuration introuvable: {args.config}")
+    
+    if args.map_file is not None:
+        env = load_env(args.map_file, step_cost=-0.01)
+    elif args.grid_size is not None:
+        size = args.grid_size
+        if size < 2:
+            raise SystemExit("La grille doit être au moins 2x2")
+        # Obstacles de la configuration contenus dans la grille, hors case du but
+        obstacles = [obs for obs in (config[3] if config else [])
+                     if obs[0] < size and obs[1] < size and tuple(obs) != (size - 1, size - 1)]
+        env = GridWorldEnv(grid_size=size, start_pos=(0, 0), goal_pos=(size - 1, size - 1),
+                           obstacles=obstacles, step_cost=-0.01)
+    else:
+        env = GridWorldEnv(grid_size=grid_size, start_pos=start_pos, goal_pos=goal_pos,
+                           obstacles=obstacles, step_cost=-0.01)
+    
+    return env, save_figures, args.output_folder or output_folder
+
+
+def run_batch(args):
+    """
+    Mode batch: entraînement puis évaluation sans saisie, sans pause et sans
+    fenêtre, avec la durée de chaque phase.
+    
+    Args:
+        args: Arguments de parse_args()
+        
+    Returns:
+        summary: Dictionnaire de la configuration, des résultats et des temps
+    """
+    timings = {}
+    
+    # ===========================
+    # ENVIRONNEMENT
+    # ===========================
+    start = time.perf_counter()
+    env, save_figures, output_folder = build_batch_env(args)
+    timings['env'] = time.perf_counter() - start
+    
+    if args.formats is not None:
+        formats = args.formats
+    elif not save_figures:
+        formats = []
+    else:
+        formats = ['txt'] if args.no_render else ['txt', 'png']
+    
+    print(f"Grille: {env.rows}x{env.cols}, {np.count_nonzero(env.grid == env.OBSTACLE)} obstacles")
+    print(f"Départ: {env.start_pos}, but: {env.goal_pos}")
+    
+    # ===========================
+    # ENTRAÎNEMENT
+    # ===========================
+    start = time.perf_counter()
+    vi_agent = ValueIterationAgent(gamma=args.gamma, theta=1e-6, backend=args.backend)
+    value_table, trace = vi_agent.train(env, max_iterations=args.max_iterations,
+                                        return_trace=True)
+    value_table = np.asarray(value_table)
+    timings['train'] = time.perf_counter() - start
+    
+    # ===========================
+    # ÉVALUATION
+    # ===========================
+    start = time.perf_counter()
+    recorder = FrameRecorder() if args.record else None
+    max_steps = args.max_steps or env.rows * env.cols
+    state = env.reset()
+    total_reward = 0.0
+    done = False
+    num_steps = 0
+    if recorder is not None:
+        recorder.record(env, value_table)
+    while not done and num_steps < max_steps:
+        state, reward, done, _ = env.step(vi_agent.choose_action(state))
+        total_reward += reward
+        num_steps += 1
+        if recorder is not None:
+            recorder.record(env, value_table)
+    timings['evaluate'] = time.perf_counter() - start
+    
+    # Le rendu des frames tourne dans un autre processus pendant la sauvegarde
+    if recorder is not None:
+        export_process = export_in_background(recorder, args.record, fps=args.fps)
+    
+    # ===========================
+    # SAUVEGARDE
+    # ===========================
+    start = time.perf_counter()
+    summary = {
+        'grid': [env.rows, env.cols],
+        'start_pos': list(env.start_pos),
+        'goal_pos': list(env.goal_pos),
+        'backend': args.backend,
+        'gamma': args.gamma,
+        'sweeps': len(trace['sweeps']),
+        'converged': trace['converged'],
+        'evaluation': {'reached_goal': bool(done and tuple(state) == env.goal_pos),
+                       'steps': num_steps, 'total_reward': float(total_reward)},
+        'timings': timings,
+        'files': []
+    }
+    
+    if formats:
+        os.makedirs(output_folder, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = os.path.join(output_folder, f"value_table_{env.rows}x{env.cols}_{timestamp}")
+        
+        if 'txt' in formats:
+            np.savetxt(prefix + '.txt', value_table, fmt='%.6f')
+            summary['files'].append(prefix + '.txt')
+        if 'npy' in formats:
+            np.save(prefix + '.npy', value_table)
+            summary['files'].append(prefix + '.npy')
+        if 'png' in formats:
+            # Rendu hors écran: aucune fenêtre n'est ouverte
+            plt.switch_backend('Agg')
+            fig, ax = env.render(value_table=value_table,
+                                 title='GridWorld - State Values après Value Iteration')
+            fig.savefig(prefix + '.png', dpi=300, bbox_inches='tight')
+            plt.close(fig)
+            summary['files'].append(prefix + '.png')
+    timings['save'] = time.perf_counter() - start
+    
+    if recorder is not None:
+        start = time.perf_counter()
+        export_process.join()
+        if export_process.exitcode != 0:
+            raise SystemExit(f"Échec de l'export des frames (code {export_process.exitcode})")
+        timings['export'] = time.perf_counter() - start
+        summary['files'].append(args.record)
+    
+    if 'json' in formats:
+        summary['files'].append(prefix + '.json')
+        with open(prefix + '.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    
+    # ===========================
+    # RÉSUMÉ
+    # ===========================
+    print("\n" + "="*60)
+    print("RÉSUMÉ")
+    print("="*60)
+    print(f"Sweeps: {summary['sweeps']} (convergé: {summary['converged']})")
+    evaluation = summary['evaluation']
+    print(f"Évaluation: but {'atteint' if evaluation['reached_goal'] else 'non atteint'} "
+          f"en {evaluation['steps']} étapes, récompense {evaluation['total_reward']:.2f}")
+    for phase, duration in timings.items():
+        print(f"  {phase:<9}: {duration:.4f} s")
+    for path in summary['files']:
+        print(f"✓ Sauvegardé: {path}")
+    
+    return summary
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        run_batch(parse_args())
+    else:
+        main()
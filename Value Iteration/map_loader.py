@@ -0,0 +1,130 @@
+import numpy as np
+import matplotlib.image as mpimg
+import os
+from grid_env import GridWorldEnv
+
+
+# Caractères des cartes ASCII
+OBSTACLE_CHARS = b'#@X'
+FREE_CHARS = b'. '
+START_CHAR = b'S'
+GOAL_CHAR = b'G'
+
+
+def load_npy(path):
+    """
+    Charge une grille d'occupation .npy en la mappant en mémoire: seul
+    l'en-tête est lu, les données sont lues à la construction de l'env.
+    """
+    occupancy = np.load(path, mmap_mode='r')
+    if occupancy.ndim != 2:
+        raise ValueError(f"{path}: la grille doit être 2D (forme {occupancy.shape})")
+    return occupancy
+
+
+def load_ascii(path):
+    """
+    Charge une carte ASCII: une ligne de texte par ligne de la grille.
+
+    '#', '@' et 'X' sont des obstacles, '.' et ' ' des cases libres; 'S' et
+    'G' marquent (facultativement) le départ et le but sur une case libre.
+
+    Returns:
+        occupancy: Array booléen (rows, cols), True pour les obstacles
+        markers: Dictionnaire des positions marquées ('start_pos', 'goal_pos')
+    """
+    with open(path, 'rb') as f:
+        lines = [line.rstrip(b'\r') for line in f.read().split(b'\n')]
+    while lines and not lines[-1]:
+        lines.pop()
+    if not lines:
+        raise ValueError(f"{path}: carte vide")
+
+    cols = len(lines[0])
+    ragged = [i for i, line in enumerate(lines) if len(line) != cols]
+    if ragged:
+        raise ValueError(f"{path}: la ligne {ragged[0] + 1} n'a pas {cols} caractères")
+
+    # Une seule conversion pour toute la carte, sans boucle par case
+    chars = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(len(lines), cols)
+
+    known = np.frombuffer(OBSTACLE_CHARS + FREE_CHARS + START_CHAR + GOAL_CHAR, dtype=np.uint8)
+    unknown = ~np.isin(chars, known)
+    if unknown.any():
+        row, col = np.argwhere(unknown)[0]
+        raise ValueError(f"{path}: caractère inconnu {chr(chars[row, col])!r} "
+                         f"en ({row}, {col})")
+
+    occupancy = np.isin(chars, np.frombuffer(OBSTACLE_CHARS, dtype=np.uint8))
+
+    markers = {}
+    for key, char in (('start_pos', START_CHAR), ('goal_pos', GOAL_CHAR)):
+        positions = np.argwhere(chars == char[0])
+        if len(positions) > 1:
+            raise ValueError(f"{path}: plusieurs cases {char.decode()!r}")
+        if len(positions) == 1:
+            markers[key] = (int(positions[0, 0]), int(positions[0, 1]))
+
+    return occupancy, markers
+
+
+def load_png(path, threshold=0.5):
+    """
+    Charge une carte en noir et blanc: les pixels sombres sont des obstacles.
+
+    Args:
+        path: Fichier image (PNG)
+        threshold: Luminosité (entre 0 et 1) en dessous de laquelle un pixel
+                   est un obstacle
+
+    Returns:
+        occupancy: Array booléen (rows, cols), True pour les obstacles
+    """
+    image = mpimg.imread(path)
+    if image.dtype == np.uint8:
+        image = image / 255.0
+    if image.ndim == 3:
+        # Canal alpha ignoré, luminosité moyenne des canaux de couleur
+        image = image[..., :3].mean(axis=2)
+    return image < threshold
+
+
+def load_occupancy(path, threshold=0.5):
+    """
+    Charge une grille d'occupation selon l'extension du fichier
+    (.npy, .png, ou carte ASCII pour toute autre extension).
+
+    Returns:
+        occupancy: Array (rows, cols), non nul pour les obstacles
+        markers: Positions de départ et de but marquées dans le fichier
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        return load_npy(path), {}
+    if extension == '.png':
+        return load_png(path, threshold), {}
+    return load_ascii(path)
+
+
+def load_env(path, env_class=GridWorldEnv, threshold=0.5, **kwargs):
+    """
+    Construit un environnement à partir d'un fichier de carte.
+
+    Args:
+        path: Fichier .npy (mappé en mémoire), .png ou carte ASCII
+        env_class: Classe d'environnement (GridWorldEnv ou DynamicGridWorldEnv),
+                   qui doit fournir from_occupancy()
+        threshold: Seuil de luminosité des cartes PNG
+        **kwargs: Paramètres du constructeur (start_pos, goal_pos, step_cost...);
+                  ils remplacent les positions marquées dans une carte ASCII
+
+    Returns:
+        env: Environnement construit
+    """
+    occupancy, markers = load_occupancy(path, threshold)
+
+    # Le goal de DynamicGridWorldEnv est tiré au hasard: marqueurs ignorés
+    if issubclass(env_class, GridWorldEnv):
+        kwargs = {**markers, **kwargs}
+
+    return env_class.from_occupancy(occupancy, **kwargs)
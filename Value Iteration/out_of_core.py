@@ -0,0 +1,202 @@
+import numpy as np
+import json
+import os
+from grid_env import mix_actions
+
+
+def create_npy(path, shape, dtype):
+    """
+    Crée un fichier .npy rempli de zéros sans allouer le tableau en mémoire.
+    """
+    array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    del array
+
+
+def read_npy_header(path):
+    """
+    Lit l'en-tête d'un fichier .npy.
+
+    Returns:
+        shape: Dimensions du tableau
+        dtype: Type des éléments
+        offset: Position (en octets) du début des données
+    """
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran_order:
+            raise ValueError(f"{path}: seul l'ordre C est supporté")
+        return shape, dtype, f.tell()
+
+
+def open_rows(path, start, stop, mode='r'):
+    """
+    Mappe en mémoire uniquement les lignes [start, stop) d'un fichier .npy 2D.
+
+    Seules ces lignes sont adressées par le processus, ce qui borne la
+    mémoire résidente à la taille d'une tuile.
+    """
+    (rows, cols), dtype, offset = read_npy_header(path)
+    return np.memmap(path, dtype=dtype, mode=mode, shape=(stop - start, cols),
+                     offset=offset + start * cols * dtype.itemsize)
+
+
+def write_obstacle_map(path, env, tile_rows=256):
+    """
+    Écrit la carte des obstacles de l'environnement dans un fichier .npy
+    booléen, par tuiles de tile_rows lignes (pas de masque de toute la grille).
+    """
+    create_npy(path, (env.rows, env.cols), np.bool_)
+
+    for start in range(0, env.rows, tile_rows):
+        stop = min(start + tile_rows, env.rows)
+        tile = open_rows(path, start, stop, mode='r+')
+        tile[:] = env.grid[start:stop] == env.OBSTACLE
+        tile.flush()
+        del tile
+
+
+def load_metadata(path):
+    """
+    Charge les métadonnées d'une table de valeurs sur disque (None si absentes).
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_metadata(path, metadata):
+    """
+    Sauvegarde les métadonnées d'une table de valeurs sur disque.
+    """
+    with open(path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+
+def _padded_tile(path, start, stop, total_rows, halo_above=None):
+    """
+    Lit les lignes [start, stop) d'un tableau avec une ligne de halo de chaque
+    côté. Aux bords de la grille, la ligne (ou colonne) de bord est répétée:
+    une action qui mène dans un mur renvoie donc la case elle-même.
+
+    Args:
+        halo_above: Ligne start - 1 à utiliser à la place de celle du fichier
+                    (valeurs de l'itération précédente déjà écrasées)
+    """
+    low = max(start - 1, 0)
+    high = min(stop + 1, total_rows)
+    rows = np.array(open_rows(path, low, high))
+
+    if start == 0:
+        rows = np.concatenate([rows[:1], rows])
+    elif halo_above is not None:
+        rows[0] = halo_above
+    if stop == total_rows:
+        rows = np.concatenate([rows, rows[-1:]])
+
+    return np.pad(rows, ((0, 0), (1, 1)), mode='edge')
+
+
+def _tile_action_values(values_path, obstacles_path, env, gamma, start, stop,
+                        halo_above=None):
+    """
+    Calcule les valeurs de chaque action pour les lignes [start, stop).
+
+    Avec glissement, les valeurs sont en espérance sur l'action exécutée.
+
+    Returns:
+        action_values: Array (num_actions, stop - start, cols)
+        old_values: Valeurs actuelles de la tuile
+        fixed: Masque des cases de valeur fixée à 0 (but et obstacles)
+    """
+    rows, cols = env.rows, env.cols
+    goal_row, goal_col = env.goal_pos
+
+    values = _padded_tile(values_path, start, stop, rows, halo_above)
+    obstacles = _padded_tile(obstacles_path, start, stop, rows)
+
+    # Masque du but sur la tuile avec halo (mêmes bords répétés)
+    row_ids = np.clip(np.arange(start - 1, stop + 1), 0, rows - 1)
+    col_ids = np.clip(np.arange(-1, cols + 1), 0, cols - 1)
+    goal = (row_ids[:, None] == goal_row) & (col_ids[None, :] == goal_col)
+
+    action_values = np.empty((env.num_actions, stop - start, cols))
+
+    # Vues décalées: UP, DOWN, LEFT, RIGHT
+    shifts = ((slice(None, -2), slice(1, -1)), (slice(2, None), slice(1, -1)),
+              (slice(1, -1), slice(None, -2)), (slice(1, -1), slice(2, None)))
+    for action, shift in enumerate(shifts):
+        next_obstacle = obstacles[shift]
+        next_goal = goal[shift]
+        rewards = np.where(next_obstacle, env.obstacle_reward,
+                           np.where(next_goal, env.goal_reward, env.step_cost))
+        dones = next_goal & ~next_obstacle
+        action_values[action] = np.where(dones, rewards, rewards + gamma * values[shift])
+
+    fixed = obstacles[1:-1, 1:-1] | goal[1:-1, 1:-1]
+    action_values = mix_actions(action_values, env.action_mixing(), axis=0)
+    return action_values, values[1:-1, 1:-1], fixed
+
+
+def tiled_sweep(values_path, obstacles_path, env, gamma, tile_rows):
+    """
+    Effectue un sweep de Value Iteration tuile par tuile sur des fichiers
+    mappés en mémoire.
+
+    Les tuiles sont traitées de haut en bas et réécrites sur place. La
+    dernière ligne de chaque tuile est conservée avant réécriture pour
+    servir de halo à la tuile suivante: le sweep utilise donc uniquement les
+    valeurs de l'itération précédente, comme le backend NumPy.
+
+    Returns:
+        delta: Variation maximale des valeurs
+        num_updated: Nombre de cases mises à jour
+    """
+    delta = 0.0
+    num_updated = 0
+    halo_above = None
+
+    for start in range(0, env.rows, tile_rows):
+        stop = min(start + tile_rows, env.rows)
+
+        action_values, old_values, fixed = _tile_action_values(
+            values_path, obstacles_path, env, gamma, start, stop, halo_above)
+
+        # But et obstacles gardent une valeur de 0
+        new_values = action_values.max(axis=0)
+        new_values[fixed] = 0
+        num_updated += int(np.count_nonzero(~fixed))
+        delta = max(delta, float(np.max(np.abs(new_values - old_values))))
+
+        # Halo de la tuile suivante: ancienne valeur de la dernière ligne
+        halo_above = old_values[-1].copy()
+
+        tile = open_rows(values_path, start, stop, mode='r+')
+        tile[:] = new_values
+        tile.flush()
+        del tile
+
+    return delta, num_updated
+
+
+def tiled_policy(values_path, obstacles_path, policy_path, env, gamma, tile_rows):
+    """
+    Extrait la politique gloutonne (une action uint8 par case) tuile par tuile
+    et l'écrit dans un fichier .npy.
+    """
+    create_npy(policy_path, (env.rows, env.cols), np.uint8)
+
+    for start in range(0, env.rows, tile_rows):
+        stop = min(start + tile_rows, env.rows)
+
+        action_values, _, _ = _tile_action_values(
+            values_path, obstacles_path, env, gamma, start, stop)
+
+        tile = open_rows(policy_path, start, stop, mode='r+')
+        tile[:] = action_values.argmax(axis=0)
+        tile.flush()
+        del tile
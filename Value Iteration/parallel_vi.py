@@ -0,0 +1,176 @@
+import numpy as np
+import multiprocessing as mp
+import time
+from grid_env import mix_actions
+from multiprocessing import shared_memory
+
+
+def _attach(name, shape, dtype):
+    """
+    Ouvre un bloc de mémoire partagée existant comme tableau NumPy.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _share(array):
+    """
+    Copie un tableau dans un nouveau bloc de mémoire partagée.
+
+    Returns:
+        shm: Bloc de mémoire partagée (à fermer et libérer par l'appelant)
+        shared: Tableau NumPy adossé au bloc
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    shared[...] = array
+    return shm, shared
+
+
+def _worker(worker_id, start, stop, names, shape, dtype, mixing, gamma, theta,
+            max_iterations, barrier):
+    """
+    Processus de calcul: met à jour la bande de lignes [start, stop).
+
+    À chaque sweep, le worker lit sa bande et les lignes frontières des bandes
+    voisines dans le buffer source, écrit sa bande dans le buffer destination,
+    publie son delta local puis attend les autres workers. Après la barrière,
+    tous lisent le même delta global et prennent la même décision d'arrêt.
+    Le worker 0 enregistre le delta et la durée de chaque sweep.
+    """
+    num_actions, rows, cols = shape
+    handles = []
+
+    def attach(key, array_shape, dtype):
+        shm, array = _attach(names[key], array_shape, dtype)
+        handles.append(shm)
+        return array
+
+    buffers = (attach('V_a', (rows, cols), dtype),
+               attach('V_b', (rows, cols), dtype))
+    rewards = attach('rewards', shape, dtype)[:, start:stop]
+    dones = attach('dones', shape, np.bool_)[:, start:stop]
+    fixed = attach('fixed', (rows, cols), np.bool_)[start:stop]
+    deltas = attach('deltas', (2, barrier.parties), np.float64)
+    iterations = attach('iterations', (1,), np.int64)
+    trace = attach('trace', (max_iterations, 2), np.float64)
+
+    band_rows = np.arange(start, stop)
+    up_rows = np.maximum(band_rows - 1, 0)
+    down_rows = np.minimum(band_rows + 1, rows - 1)
+    col_ids = np.arange(cols)
+    left_cols = np.maximum(col_ids - 1, 0)
+    right_cols = np.minimum(col_ids + 1, cols - 1)
+
+    action_values = np.empty((num_actions, stop - start, cols), dtype=dtype)
+
+    try:
+        sweep_start = time.perf_counter()
+        for iteration in range(max_iterations):
+            src = buffers[iteration % 2]
+            dst = buffers[(iteration + 1) % 2]
+            band = src[start:stop]
+
+            # Vues décalées (UP, DOWN, LEFT, RIGHT); contre un mur l'agent reste en place
+            next_values = (src[up_rows], src[down_rows], band[:, left_cols], band[:, right_cols])
+            for action in range(num_actions):
+                action_values[action] = np.where(
+                    dones[action], rewards[action],
+                    rewards[action] + gamma * next_values[action])
+
+            # Glissement: espérance sur l'action exécutée
+            new_band = mix_actions(action_values, mixing, axis=0).max(axis=0)
+            new_band[fixed] = 0
+            dst[start:stop] = new_band
+
+            deltas[iteration % 2, worker_id] = np.max(np.abs(new_band - band), initial=0.0)
+            barrier.wait()
+
+            # Réduction globale: tous les workers lisent le même delta
+            delta = deltas[iteration % 2].max()
+            if worker_id == 0:
+                iterations[0] = iteration + 1
+                now = time.perf_counter()
+                trace[iteration] = (delta, now - sweep_start)
+                sweep_start = now
+                if (iteration + 1) % 100 == 0:
+                    print(f"Itération {iteration + 1}: Delta = {delta:.6f}")
+            if delta < theta:
+                break
+    except BaseException:
+        # Débloquer les autres workers en attente à la barrière
+        barrier.abort()
+        raise
+    finally:
+        for shm in handles:
+            shm.close()
+
+
+def parallel_value_iteration(rewards, dones, fixed, gamma, theta, max_iterations,
+                             num_workers, dtype=np.float64, mixing=None):
+    """
+    Value Iteration parallèle par décomposition en bandes de lignes.
+
+    Chaque worker possède une bande de lignes de la grille. Les deux tables de
+    valeurs (source et destination, échangées à chaque sweep) vivent en
+    mémoire partagée. Les sweeps sont synchrones (Jacobi), comme le backend
+    NumPy de ValueIterationAgent, et donnent donc les mêmes valeurs.
+
+    Args:
+        rewards: Array (num_actions, rows, cols) des récompenses
+        dones: Array booléen (num_actions, rows, cols) des transitions terminales
+        fixed: Array booléen (rows, cols) des cases de valeur fixée à 0
+        gamma: Facteur d'actualisation
+        theta: Seuil de convergence
+        max_iterations: Nombre maximum de sweeps
+        num_workers: Nombre de processus
+        dtype: Type des valeurs (np.float64 ou np.float32)
+        mixing: Matrice (A, A) des probabilités d'exécution (glissement), ou None
+
+    Returns:
+        V: Table des valeurs (rows, cols)
+        iterations: Nombre de sweeps effectués
+        trace: Array (iterations, 2) du delta et de la durée de chaque sweep
+    """
+    shape = rewards.shape
+    rows, cols = shape[1], shape[2]
+    num_workers = max(1, min(num_workers, rows))
+    bands = np.array_split(np.arange(rows), num_workers)
+
+    blocks = {}
+    try:
+        for key, array in (('V_a', np.zeros((rows, cols), dtype=dtype)),
+                           ('V_b', np.zeros((rows, cols), dtype=dtype)),
+                           ('rewards', np.ascontiguousarray(rewards, dtype=dtype)),
+                           ('dones', np.ascontiguousarray(dones, dtype=np.bool_)),
+                           ('fixed', np.ascontiguousarray(fixed, dtype=np.bool_)),
+                           ('deltas', np.zeros((2, num_workers))),
+                           ('iterations', np.zeros(1, dtype=np.int64)),
+                           ('trace', np.zeros((max_iterations, 2)))):
+            blocks[key] = _share(array)
+        names = {key: shm.name for key, (shm, _) in blocks.items()}
+
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(num_workers)
+        workers = [ctx.Process(target=_worker,
+                               args=(worker_id, int(band[0]), int(band[-1]) + 1, names,
+                                     shape, np.dtype(dtype), mixing, gamma, theta,
+                                     max_iterations, barrier))
+                   for worker_id, band in enumerate(bands)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        failed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Échec de {len(failed)} worker(s) (codes: {failed})")
+
+        iterations = int(blocks['iterations'][1][0])
+        V = blocks['V_a' if iterations % 2 == 0 else 'V_b'][1].copy()
+        trace = blocks['trace'][1][:iterations].copy()
+        return V, iterations, trace
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()